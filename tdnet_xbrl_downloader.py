@@ -13,17 +13,210 @@ uv run python tdnet_xbrl_downloader.py --extract-all -d 2025-09-15 --filter kess
 
 import argparse
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
+import lxml.etree
+import lxml.html
 import urllib.parse
 from datetime import datetime, timedelta
 import os
+import shutil
 import zipfile
 from pathlib import Path
-import time
 import sys
+import threading
+import time
 import json
+import unicodedata
 import csv
-from typing import Dict, List, Optional, Union
+import fnmatch
+import io
+import functools
+import hashlib
+import itertools
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# orjsonがインストールされていれば高速なJSONシリアライズに使用（任意）
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# iXBRL(.htm)はXML宣言付きのXHTMLだが、contextref等の小文字化を前提にHTMLパーサー(lxml)で解析する
+# 要素はname属性で引くため、id属性の索引（collect_ids）は作らない
+_IXBRL_PARSER = lxml.html.HTMLParser(encoding='utf-8', collect_ids=False)
+
+# iXBRLの検索に使うXPath（ファイルごとに式を再コンパイルしないよう事前にコンパイル）
+_XPATH_NAMED = lxml.etree.XPath('//*[@name]')
+_XPATH_NAME_PREFIX = lxml.etree.XPath('//*[starts-with(@name, $prefix)]')
+
+# (name, contextref) → 要素 の索引（contextrefがNoneのキーはコンテキストを問わない検索用）
+XbrlIndex = Dict[Tuple[str, Optional[str]], lxml.html.HtmlElement]
+
+# 正規表現（呼び出しごとのコンパイル・キャッシュ参照を避けるため事前にコンパイル）
+_RE_COUNT = re.compile(r'\d+[～~].*全(\d+)件')  # 件数表示（1～100件 / 全136件）
+_RE_COUNT_TEXT = re.compile(r'\d+.*\d+.*件')
+_RE_WS = re.compile(r'\s+')
+_RE_JP_DATE = re.compile(r'(\d{4})年(\d{1,2})月(\d{1,2})日')
+
+# 自動抽出の対象とする名前空間プレフィックス
+_TSE_PREFIX = 'tse-ed-t:'
+_JPPFS_PREFIX = 'jppfs_cor:'
+_JPPFS_PREFIX_BYTES = _JPPFS_PREFIX.encode('ascii')  # 解析前にファイル内容を確認する用
+
+# 開示タイトルのフィルター用（訂正版・修正版の表記はすべて「訂正」「修正」を含む）
+_RE_REIT_TITLE = re.compile('ＲＥＩＴ|リート|REIT')
+_RE_CORRECTION_TITLE = re.compile('訂正|修正')
+_RE_GYOSEKI_TITLE = re.compile('業績予想|業績の修正')
+
+# ページング調査で探す「次へ」系のキーワード（表示順）
+NEXT_KEYWORDS = ['次へ', 'next', '→', '＞', 'Next']
+_RE_NEXT_KEYWORDS = re.compile('|'.join(map(re.escape, NEXT_KEYWORDS)))
+
+# HTTP通信設定（接続を使い回してTCP/TLSハンドシェイクを削減）
+REQUEST_TIMEOUT = (5, 30)  # (接続, 読み込み) 秒
+LIST_FETCH_WORKERS = 4  # 一覧ページ取得の同時接続数（サーバー負荷を考慮して控えめに）
+DOWNLOAD_WORKERS = 4  # XBRLファイルの同時ダウンロード数
+DOWNLOAD_INTERVAL = 1.0  # ダウンロード開始の最小間隔（秒、全スレッド合計で従来の1件/秒を超えないようにする）
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # ダウンロード時の読み込みバッファ（1MiB）
+LIST_CHUNK_SIZE = 64 * 1024  # 一覧ページを解析しながら受信する単位（64KiB）
+LIST_DEFAULT_ENCODING = 'utf-8'  # 一覧ページの文字コード（Content-Typeでcharsetが指定されていない場合）
+EXTRACT_WORKERS = None  # 財務データ抽出のプロセス数（NoneはCPUコア数）
+REMOVE_WORKERS = 8  # 後片付けでファイルを並列に削除するスレッド数
+READ_AHEAD_FILES = 2  # Attachmentファイルを解析中に先読みする数（読み込みと解析を重ねる）
+
+# 通信エラーとして扱う例外（response.rawを直接読む場合、途中の切断やタイムアウトはurllib3の例外のまま送出される）
+NETWORK_ERRORS = (requests.exceptions.RequestException, Urllib3HTTPError)
+
+SESSION = requests.Session()
+SESSION.headers['User-Agent'] = 'Mozilla/5.0 (compatible; tdnet-xbrl-downloader/0.1)'
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
+
+# キャッシュ設定（一覧ページのHTMLと財務データ抽出結果を再実行時に再利用）
+CACHE_DIR = Path('.cache') / 'tdnet'
+USE_LIST_CACHE = True  # Falseの場合は一覧ページのキャッシュを読まずに取得し直す（--no-cache）
+LIST_CACHE_TTL = 5 * 60  # 当日分の一覧の解析結果を再利用する秒数（翌日以降に取得した一覧は確定済みとして常に再利用）
+EXTRACT_CACHE_VERSION = 1  # 財務データ抽出結果のキャッシュの版（抽出結果が変わる修正をしたら上げ、古い結果を使わないようにする）
+EXTRACT_CACHE_MAX_FILES = 2000  # 財務データ抽出キャッシュの各ディレクトリに残すファイル数の上限（最近使っていないものから削除）
+LIST_CACHE_MAX_PAGES = 1000  # 一覧ページのキャッシュを残すページ数の上限（HTML・メタデータ・解析結果をまとめて削除）
+# 上限を適用するキャッシュのディレクトリと、残すエントリ数の上限
+# （エントリは名前の最初の.より前が同じファイルの組。一覧ページは日付・ページごとに3ファイル）
+CACHE_LIMITS = (
+    ('financial', EXTRACT_CACHE_MAX_FILES),
+    ('comprehensive', EXTRACT_CACHE_MAX_FILES),
+    ('lists', LIST_CACHE_MAX_PAGES),
+)
+
+
+def _json_dumps(obj, indent=False) -> bytes:
+    """
+    JSON文字列（UTF-8のbytes）に変換
+    
+    Args:
+        obj: 変換するオブジェクト
+        indent: 2スペースでインデントするかどうか
+    
+    Returns:
+        UTF-8でエンコードされたJSON
+    """
+    
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode('utf-8')
+
+
+def _read_json_cache(cache_file: Path) -> Optional[Dict]:
+    """JSONキャッシュを読み込む（存在しない・壊れている場合はNone）"""
+    
+    try:
+        data = cache_file.read_bytes()
+        return orjson.loads(data) if orjson is not None else json.loads(data)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache_file(cache_file: Path, data: bytes):
+    """キャッシュファイルを書き込む（一時ファイル経由で置き換え、失敗しても処理は継続）"""
+    
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"⚠️ キャッシュ書き込みエラー: {e}")
+
+
+def _write_json_cache(cache_file: Path, obj: Dict):
+    """JSONキャッシュを書き込む"""
+    
+    _write_cache_file(cache_file, _json_dumps(obj))
+
+
+def _extract_cache_key():
+    """財務データ抽出キャッシュのキー用ハッシュを作成（キャッシュの版を含める）"""
+    
+    key = hashlib.blake2b(digest_size=16)
+    key.update(f"v{EXTRACT_CACHE_VERSION}\0".encode('ascii'))
+    return key
+
+
+def _read_lru_cache(cache_file: Path) -> Optional[Dict]:
+    """JSONキャッシュを読み込み、使用したファイルの更新時刻を更新する（削除はprune_cacheで古い順）"""
+    
+    data = _read_json_cache(cache_file)
+    if data is not None:
+        try:
+            os.utime(cache_file)
+        except OSError:
+            pass
+    return data
+
+
+def prune_cache(limits=CACHE_LIMITS):
+    """
+    キャッシュを上限のエントリ数まで削除（最近使っていないものから）
+    
+    Args:
+        limits: (CACHE_DIR内のディレクトリ名, 残すエントリ数の上限) のタプルの並び
+    """
+    
+    for name, max_entries in limits:
+        # 同じエントリのファイル（一覧ページのHTML・.json・.records.jsonなど）はまとめて扱い、最も新しい更新時刻で比べる
+        entries = {}
+        try:
+            with os.scandir(CACHE_DIR / name) as it:
+                for entry in it:
+                    if not entry.is_file():
+                        continue
+                    key = entry.name.split('.', 1)[0]
+                    paths, mtime_ns = entries.get(key, ([], 0))
+                    paths.append(entry.path)
+                    entries[key] = (paths, max(mtime_ns, entry.stat().st_mtime_ns))
+        except FileNotFoundError:
+            continue
+        
+        if len(entries) <= max_entries:
+            continue
+        
+        oldest = sorted(entries.values(), key=lambda item: item[1])[:len(entries) - max_entries]
+        for paths, _ in oldest:
+            for path in paths:
+                try:
+                    os.unlink(path)
+                except OSError as e:
+                    print(f"⚠️ キャッシュ削除エラー: {e}")
+
 
 def analyze_pagination_structure(soup, debug=False):
     """
@@ -51,12 +244,22 @@ def analyze_pagination_structure(soup, debug=False):
         print("【ページング構造調査】")
         print("-"*60)
     
-    # 「次へ」ボタンや類似要素を探す
-    next_keywords = ['次へ', 'next', '→', '＞', 'Next']
+    # 「次へ」ボタンや類似要素を探す（リンク・ボタンを一度だけ走査してキーワード別に振り分け）
+    next_links_by_keyword = {keyword: [] for keyword in NEXT_KEYWORDS}
+    next_buttons_by_keyword = {keyword: [] for keyword in NEXT_KEYWORDS}
     
-    for keyword in next_keywords:
-        # aタグで検索
-        next_links = soup.find_all('a', string=lambda text: text and keyword in text)
+    for elem in soup.find_all(['a', 'input', 'button']):
+        if elem.name == 'a':
+            text, found = elem.string, next_links_by_keyword
+        else:
+            text, found = elem.get('value'), next_buttons_by_keyword
+        if text:
+            for keyword in set(_RE_NEXT_KEYWORDS.findall(text)):
+                found[keyword].append(elem)
+    
+    for keyword in NEXT_KEYWORDS:
+        # aタグ
+        next_links = next_links_by_keyword[keyword]
         if next_links and debug:
             print(f"\n「{keyword}」を含むリンク: {len(next_links)}個")
             for i, link in enumerate(next_links[:3]):
@@ -65,8 +268,8 @@ def analyze_pagination_structure(soup, debug=False):
                 parent = link.parent.name if link.parent else 'なし'
                 print(f"  {i+1}. href='{href}', onclick='{onclick}', parent=<{parent}>")
         
-        # input/buttonで検索
-        next_buttons = soup.find_all(['input', 'button'], value=lambda value: value and keyword in value if value else False)
+        # input/button
+        next_buttons = next_buttons_by_keyword[keyword]
         if next_buttons and debug:
             print(f"\n「{keyword}」を含むボタン: {len(next_buttons)}個")
             for i, button in enumerate(next_buttons[:3]):
@@ -79,17 +282,23 @@ def analyze_pagination_structure(soup, debug=False):
     if debug:
         print(f"\n【ページ番号・件数情報】")
         
-        # 件数表示パターンを探す (1～100件 / 全136件 のような)
-        import re
-        count_patterns = soup.find_all(string=re.compile(r'\d+～\d+.*全\d+'))
+        # テキストを一度だけ走査して件数表示・件数関連テキストを探す
+        count_patterns = []
+        number_patterns = []
+        for text in soup.find_all(string=True):
+            if _RE_COUNT.search(text):
+                count_patterns.append(text)
+            if _RE_COUNT_TEXT.search(text):
+                number_patterns.append(text)
+        
+        # 件数表示パターン (1～100件 / 全136件 のような)
         if count_patterns:
             print(f"件数表示パターン: {len(count_patterns)}個")
             for i, pattern in enumerate(count_patterns):
                 text = pattern.strip()
                 print(f"  {i+1}. '{text}'")
         
-        # より広いパターンで数字を含む表示を探す
-        number_patterns = soup.find_all(string=re.compile(r'\d+.*\d+.*件'))
+        # より広いパターンで数字を含む表示
         if number_patterns:
             print(f"件数関連テキスト: {len(number_patterns)}個")
             for i, pattern in enumerate(number_patterns[:5]):
@@ -191,11 +400,10 @@ def check_all_pages_duplicates(date_str, max_pages=15):
     all_records = []
     page_stats = []
     
-    for page in range(1, max_pages + 1):
-        print(f"\nページ {page} を確認中...")
-        
-        try:
-            records = fetch_xbrl_list(date_str, debug=False, page=page)
+    try:
+        # ページを並列に取得し、ページ順に確認する
+        for page, records in fetch_xbrl_pages(date_str, range(1, max_pages + 1)):
+            print(f"\nページ {page} を確認中...")
             
             if not records:
                 print(f"  ページ {page}: データなし（終了）")
@@ -237,12 +445,8 @@ def check_all_pages_duplicates(date_str, max_pages=15):
             all_xbrl_urls.update(page_urls)
             all_records.extend(records)
             
-            # 少し待機
-            time.sleep(0.5)
-            
-        except Exception as e:
-            print(f"  ページ {page}: エラー - {e}")
-            break
+    except Exception as e:
+        print(f"  ページ取得エラー - {e}")
     
     # 結果サマリー
     print(f"\n" + "="*60)
@@ -299,109 +503,66 @@ def fetch_all_pages_xbrl(date_str, debug=False):
     print("="*60)
     
     all_xbrl_records = []
-    page = 1
     total_pages = 0
     
     # 1ページ目で総件数を取得
     print("1ページ目で総件数を確認中...")
-    first_page_records = fetch_xbrl_list(date_str, debug=False, page=1)
+    first_page_records, total_count = fetch_xbrl_list_with_count(date_str, debug=False, page=1)
     
     if not first_page_records:
         print("❌ 1ページ目のデータが取得できませんでした")
         return []
     
-    # 総件数を取得するために再度アクセス
-    try:
-        url = f'https://www.release.tdnet.info/inbs/I_list_001_{date_str}.html'
-        r = requests.get(url)
-        r.raise_for_status()
-        soup = BeautifulSoup(r.content, 'html.parser')
-        r.close()
-        
-        # 件数表示パターンを探す (1～100件 / 全1048件 のような)
-        import re
-        count_patterns = soup.find_all(string=re.compile(r'\d+～\d+.*全(\d+)'))
-        total_count = 0
-        
-        for pattern in count_patterns:
-            match = re.search(r'全(\d+)件', pattern)
-            if match:
-                total_count = int(match.group(1))
-                break
-        
-        if total_count > 0:
-            total_pages = (total_count + 99) // 100  # 切り上げ計算
-            print(f"総件数: {total_count}件")
-            print(f"予想ページ数: {total_pages}ページ")
-        else:
-            print("総件数が取得できませんでした。順次アクセスで確認します。")
-            total_pages = 20  # 最大20ページまで確認
-            
-    except Exception as e:
-        print(f"総件数取得エラー: {e}")
-        total_pages = 20  # エラー時は最大20ページ
+    # 1ページ目の件数表示から総ページ数を求める
+    if total_count:
+        total_pages = (total_count + 99) // 100  # 切り上げ計算
+        print(f"総件数: {total_count}件")
+        print(f"予想ページ数: {total_pages}ページ")
+    else:
+        print("総件数が取得できませんでした。順次アクセスで確認します。")
+        total_pages = 20  # 最大20ページまで確認
     
-    # 全ページを順次取得
+    # 2ページ目以降を並列取得（結果はページ順に処理）
     print(f"\n全ページのXBRLデータを取得開始...")
     print("-"*60)
     
-    for page in range(1, total_pages + 1):
-        print(f"\nページ {page}/{total_pages if total_pages <= 20 else '?'} を取得中...")
+    fetched_pages = 0
+    try:
+        page_results = [(1, first_page_records)]
+        if total_pages > 1:
+            print(f"\nページ 2～{total_pages} を並列取得中（同時接続数: {LIST_FETCH_WORKERS}）...")
+            page_results = itertools.chain(page_results, fetch_xbrl_pages(date_str, range(2, total_pages + 1)))
         
-        try:
-            if page == 1:
-                # 1ページ目は既に取得済み
-                records = first_page_records
-            else:
-                records = fetch_xbrl_list(date_str, debug=False, page=page)
-            
+        for page, records in page_results:
             if not records:
-                print(f"  ページ {page}: データなし（全{page-1}ページで完了）")
+                print(f"  ページ {page}: データなし（全{fetched_pages}ページで完了）")
                 break
             
             # XBRLデータのみを抽出
             xbrl_records = [r for r in records if r.get('xbrl_url')]
             
-            print(f"  ページ {page}: {len(records)}件の開示情報, {len(xbrl_records)}件のXBRL")
+            print(f"  ページ {page}/{total_pages}: {len(records)}件の開示情報, {len(xbrl_records)}件のXBRL")
             
             # 累積データに追加
             all_xbrl_records.extend(xbrl_records)
-            
-            # サーバーに負荷をかけないよう少し待機
-            if page < total_pages:
-                time.sleep(0.5)
+            fetched_pages += 1
                 
-        except requests.exceptions.HTTPError as e:
-            if "404" in str(e):
-                print(f"  ページ {page}: 存在しません（全{page-1}ページで完了）")
-                break
-            else:
-                print(f"  ページ {page}: HTTPエラー - {e}")
-                break
-        except Exception as e:
-            print(f"  ページ {page}: エラー - {e}")
-            break
-    
-    # 重複排除（念のため）
-    unique_urls = set()
-    unique_records = []
-    duplicates_removed = 0
+    except Exception as e:
+        print(f"  ページ {fetched_pages + 1}: エラー - {e}")
     
+    # 重複排除（念のため）。辞書の挿入順を利用し、URLごとに最初のレコードを残す
+    unique = {}
     for record in all_xbrl_records:
-        xbrl_url = record.get('xbrl_url')
-        if xbrl_url and xbrl_url not in unique_urls:
-            unique_urls.add(xbrl_url)
-            unique_records.append(record)
-        elif xbrl_url:
-            duplicates_removed += 1
+        unique.setdefault(record['xbrl_url'], record)
+    unique_records = list(unique.values())
+    duplicates_removed = len(all_xbrl_records) - len(unique_records)
     
     # 結果サマリー
     print(f"\n" + "="*60)
     print("【全ページ取得結果】")
     print("="*60)
     
-    actual_pages = page - 1 if page > 1 else 1
-    print(f"取得ページ数: {actual_pages}ページ")
+    print(f"取得ページ数: {fetched_pages}ページ")
     print(f"総XBRLデータ: {len(all_xbrl_records)}件")
     print(f"ユニークXBRL: {len(unique_records)}件")
     if duplicates_removed > 0:
@@ -412,6 +573,113 @@ def fetch_all_pages_xbrl(date_str, debug=False):
     return unique_records
 
 
+def iter_list_html(date_str, page=1, response_info=None):
+    """
+    指定日付・ページの一覧ページHTMLを少しずつ取得（ディスクキャッシュ付き）
+    
+    日付が変わった後に取得した一覧は確定済みとみなし、通信せずキャッシュを返す。
+    それ以外はETag/Last-Modifiedで再検証し、変更がなければ（304）キャッシュを返す。
+    受信したHTMLは読み進めながらキャッシュファイルに書き出す。
+    
+    Args:
+        date_str: YYYYMMDD形式の日付文字列
+        page: 取得するページ番号
+        response_info: 渡した場合、最初の断片を返す前に'encoding'（HTMLの文字コード）を設定する辞書
+    
+    Yields:
+        一覧ページのHTMLの断片（bytes）
+    
+    Raises:
+        requests.exceptions.RequestException: 通信エラー・HTTPエラーの場合
+        urllib3.exceptions.HTTPError: 受信途中の切断・タイムアウトの場合
+    """
+    
+    url = f'https://www.release.tdnet.info/inbs/I_list_{page:03d}_{date_str}.html'
+    cache_file = CACHE_DIR / 'lists' / f'I_list_{page:03d}_{date_str}.html'
+    meta_file = cache_file.with_suffix('.json')
+    
+    meta = _read_json_cache(meta_file) if USE_LIST_CACHE and cache_file.exists() else None
+    if response_info is None:
+        response_info = {}
+    if meta and meta.get('fetched_date', '') > date_str:
+        response_info['encoding'] = meta.get('encoding') or LIST_DEFAULT_ENCODING
+        yield cache_file.read_bytes()
+        return
+    
+    # 条件付きリクエストで再検証
+    headers = {}
+    if meta and meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    if meta and meta.get('last_modified'):
+        headers['If-Modified-Since'] = meta['last_modified']
+    
+    with SESSION.get(url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT) as r:
+        if r.status_code == 304 and meta:
+            response_info['encoding'] = meta.get('encoding') or LIST_DEFAULT_ENCODING
+            yield cache_file.read_bytes()
+        else:
+            r.raise_for_status()
+            
+            # 文字コードはContent-Typeのcharsetを優先する（指定がない場合、requestsはtext/htmlをISO-8859-1とみなすため使わない）
+            charset_specified = 'charset' in r.headers.get('Content-Type', '').lower()
+            response_info['encoding'] = (r.encoding if charset_specified else None) or LIST_DEFAULT_ENCODING
+            
+            # 受信しながら呼び出し側（パーサー）に渡し、同時にキャッシュ用の一時ファイルへ書き出す
+            tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp = open(tmp_file, 'wb')
+            except OSError as e:
+                print(f"⚠️ キャッシュ書き込みエラー: {e}")
+                tmp = None
+            
+            completed = False
+            try:
+                r.raw.decode_content = True
+                for chunk in iter(lambda: r.raw.read(LIST_CHUNK_SIZE), b''):
+                    if tmp:
+                        tmp.write(chunk)
+                    yield chunk
+                completed = True
+            finally:
+                if tmp:
+                    tmp.close()
+                    try:
+                        if completed:
+                            os.replace(tmp_file, cache_file)
+                        else:
+                            os.remove(tmp_file)
+                    except OSError as e:
+                        print(f"⚠️ キャッシュ書き込みエラー: {e}")
+        
+        _write_json_cache(meta_file, {
+            'etag': r.headers.get('ETag', meta.get('etag') if meta else None),
+            'last_modified': r.headers.get('Last-Modified', meta.get('last_modified') if meta else None),
+            'fetched_date': datetime.now().strftime('%Y%m%d'),
+            'encoding': response_info['encoding']
+        })
+
+
+def fetch_list_html(date_str, page=1, response_info=None):
+    """
+    指定日付・ページの一覧ページHTMLをまとめて取得（iter_list_htmlの結果を連結）
+    
+    Args:
+        date_str: YYYYMMDD形式の日付文字列
+        page: 取得するページ番号
+        response_info: 渡した場合、'encoding'（HTMLの文字コード）を設定する辞書
+    
+    Returns:
+        一覧ページのHTML（bytes）
+    
+    Raises:
+        requests.exceptions.RequestException: 通信エラー・HTTPエラーの場合
+        urllib3.exceptions.HTTPError: 受信途中の切断・タイムアウトの場合
+    """
+    
+    return b''.join(iter_list_html(date_str, page, response_info))
+
+
 def fetch_xbrl_list(date_str="20250819", debug=False, page=1):
     """
     指定日付・ページのXBRLファイル一覧を取得
@@ -425,93 +693,223 @@ def fetch_xbrl_list(date_str="20250819", debug=False, page=1):
         XBRLデータのリスト
     """
     
+    records, _ = fetch_xbrl_list_with_count(date_str, debug=debug, page=page)
+    return records
+
+
+def fetch_xbrl_list_with_count(date_str, debug=False, page=1):
+    """
+    指定日付・ページのXBRLファイル一覧と総件数を取得
+    
+    Args:
+        date_str: YYYYMMDD形式の日付文字列
+        debug: デバッグ情報を表示するかどうか
+        page: 取得するページ番号
+    
+    Returns:
+        (XBRLデータのリスト, 総件数) のタプル（総件数が取得できない場合はNone）
+    """
+    
     # ページ番号に応じてURLを構築
     url = f'https://www.release.tdnet.info/inbs/I_list_{page:03d}_{date_str}.html'
     print(f"アクセス先URL (ページ{page}): {url}\n")
     
+    # 前回の解析結果が有効なら通信・解析を省略（デバッグ時はページ構造を表示するため常に解析）
+    records_cache_file = CACHE_DIR / 'lists' / f'I_list_{page:03d}_{date_str}.records.json'
+    if not debug and USE_LIST_CACHE:
+        cached = _read_lru_cache(records_cache_file)
+        if cached and (cached.get('fetched_date', '') > date_str
+                       or time.time() - cached.get('fetched_at', 0) < LIST_CACHE_TTL):
+            return cached['records'], cached['total']
+    
     try:
-        r = requests.get(url)
-        r.raise_for_status()
-        soup = BeautifulSoup(r.content, 'html.parser')
-        r.close()
-        
-        # デバッグモードの場合はページング構造を分析
-        if debug:
-            analyze_pagination_structure(soup, debug=True)
-        
-        xbrl_record_list = []
-        
-        # メインテーブルの全行を取得
-        tr_elms = soup.select('table#main-list-table > tr')
-        if debug or not debug:  # 常に表示
-            print(f"テーブル内の総行数: {len(tr_elms)}")
-        
-        for tr_elm in tr_elms:
-            # 各項目を初期化
-            kj_time_str = None
-            kj_code_str = None
-            kj_name_str = None
-            kj_title_str = None
-            pdf_url_str = None
-            xbrl_url_str = None
-            kj_place_str = None
-            kj_history_str = None
-            
-            # 各セルを処理
-            td_elms = tr_elm.select('td')
-            for td_elm in td_elms:
-                class_list = td_elm.get("class", [])
-                
-                if 'kjTime' in class_list:
-                    kj_time_str = td_elm.get_text().strip()
-                    
-                elif 'kjCode' in class_list:
-                    kj_code_str = td_elm.get_text().strip()
-                    
-                elif 'kjName' in class_list:
-                    kj_name_str = td_elm.get_text().strip()
-                    
-                elif 'kjPlace' in class_list:
-                    kj_place_str = td_elm.get_text().strip()
-                    
-                elif 'kjHistroy' in class_list:
-                    kj_history_str = td_elm.get_text().strip()
-                    
-                elif 'kjTitle' in class_list:
-                    a_elm = td_elm.select_one('a')
-                    if a_elm:
-                        kj_title_str = a_elm.get_text().strip()
-                        pdf_name_str = a_elm.get("href")
-                        pdf_url_str = urllib.parse.urljoin('https://www.release.tdnet.info/inbs/', pdf_name_str)
-                        
-                elif 'kjXbrl' in class_list:
-                    a_elm = td_elm.select_one('a')
-                    if a_elm is not None:
-                        xbrl_name_str = a_elm.get("href")
-                        xbrl_url_str = urllib.parse.urljoin('https://www.release.tdnet.info/inbs/', xbrl_name_str)
-            
-            # XBRLリンクがある場合のみ記録
-            if xbrl_url_str:
-                record = {
-                    'time': kj_time_str,
-                    'code': kj_code_str,
-                    'name': kj_name_str,
-                    'title': kj_title_str,
-                    'pdf_url': pdf_url_str,
-                    'xbrl_url': xbrl_url_str,
-                    'place': kj_place_str,
-                    'history': kj_history_str
-                }
-                xbrl_record_list.append(record)
-        
-        return xbrl_record_list
-        
-    except requests.exceptions.RequestException as e:
+        # デバッグ時はBeautifulSoupでも解析するためHTML全体を取得し、通常は受信しながら解析する
+        response_info = {}
+        html = fetch_list_html(date_str, page, response_info) if debug else iter_list_html(date_str, page, response_info)
+        records, total = parse_xbrl_list_html(html, debug=debug, response_info=response_info)
+        
+    except NETWORK_ERRORS as e:
         print(f"❌ エラー: {e}")
-        return []
+        return [], None
+    
+    _write_json_cache(records_cache_file, {
+        'records': records,
+        'total': total,
+        'fetched_date': datetime.now().strftime('%Y%m%d'),
+        'fetched_at': time.time()
+    })
+    return records, total
 
 
-def download_xbrl_file(url, save_dir="downloads", company_name="", code=""):
+def fetch_xbrl_pages(date_str, pages, max_workers=LIST_FETCH_WORKERS):
+    """
+    複数ページのXBRLファイル一覧を並列に取得
+    
+    Args:
+        date_str: YYYYMMDD形式の日付文字列
+        pages: 取得するページ番号のリスト
+        max_workers: 同時接続数の上限
+    
+    Yields:
+        (ページ番号, XBRLデータのリスト) のタプル（ページ順）
+    """
+    
+    # 先読みは同時接続数までに抑え、呼び出し側が途中で打ち切った場合に余分なアクセスをしない
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for page in pages:
+            pending.append((page, executor.submit(fetch_xbrl_list, date_str, False, page)))
+            if len(pending) >= max_workers:
+                done_page, future = pending.popleft()
+                yield done_page, future.result()
+        
+        while pending:
+            done_page, future = pending.popleft()
+            yield done_page, future.result()
+
+
+def _cell_text(td_by_class, class_name):
+    """クラス名に対応するセルのテキストを取得（セルがない場合は空文字）"""
+    
+    td_elm = td_by_class.get(class_name)
+    return td_elm.text_content().strip() if td_elm is not None else ''
+
+
+def parse_xbrl_list_html(html, debug=False, response_info=None):
+    """
+    XBRLファイル一覧ページのHTMLを解析
+    
+    Args:
+        html: 一覧ページのHTML（bytes、またはbytesの断片を返すイテラブル）
+        debug: デバッグ情報を表示するかどうか（htmlがbytesの場合のみ）
+        response_info: 'encoding'（HTMLの文字コード）を持つ辞書（iter_list_htmlが設定、未設定ならUTF-8）
+    
+    Returns:
+        (XBRLデータのリスト, 総件数) のタプル（総件数が取得できない場合はNone）
+    """
+    
+    # <meta charset>のないページをlatin-1として解釈しないよう、文字コードを明示する
+    # （iter_list_htmlは最初の断片を返す前に設定するため、パーサーは最初の断片を受け取ってから作る）
+    if response_info is None:
+        response_info = {}
+    
+    if isinstance(html, bytes):
+        encoding = response_info.get('encoding') or LIST_DEFAULT_ENCODING
+        tree = lxml.html.fromstring(html, parser=lxml.html.HTMLParser(encoding=encoding))
+    else:
+        # 断片ごとにパーサーへ渡し、受信と解析を重ねる
+        parser = None
+        for chunk in html:
+            if parser is None:
+                parser = lxml.html.HTMLParser(encoding=response_info.get('encoding') or LIST_DEFAULT_ENCODING)
+            parser.feed(chunk)
+        tree = parser.close() if parser is not None else lxml.html.fromstring('<html></html>')
+    
+    # デバッグモードの場合はページング構造を分析
+    if debug:
+        analyze_pagination_structure(BeautifulSoup(html, 'lxml', from_encoding=encoding), debug=True)
+    
+    xbrl_record_list = []
+    
+    # メインテーブルの全行を取得（以降の検索はテーブル内の行に限定）
+    table_elm = tree.find('.//table[@id="main-list-table"]')
+    tr_elms = table_elm.findall('tr') if table_elm is not None else []
+    if debug or not debug:  # 常に表示
+        print(f"テーブル内の総行数: {len(tr_elms)}")
+    
+    for tr_elm in tr_elms:
+        # 行の直下のセルを一度だけ走査し、クラス名で引けるようにする
+        td_by_class = {}
+        for td_elm in tr_elm.iterchildren('td'):
+            for class_name in td_elm.get('class', '').split():
+                td_by_class.setdefault(class_name, td_elm)
+        
+        # XBRLリンクがある場合のみ記録
+        xbrl_td = td_by_class.get('kjXbrl')
+        xbrl_a = xbrl_td.find('a') if xbrl_td is not None else None
+        if xbrl_a is None or not xbrl_a.get('href'):
+            continue
+        
+        # タイトルとPDFリンク
+        kj_title_str = None
+        pdf_url_str = None
+        title_td = td_by_class.get('kjTitle')
+        title_a = title_td.find('a') if title_td is not None else None
+        if title_a is not None:
+            kj_title_str = title_a.text_content().strip()
+            pdf_name_str = title_a.get("href")
+            pdf_url_str = urllib.parse.urljoin('https://www.release.tdnet.info/inbs/', pdf_name_str)
+        
+        record = {
+            'time': _cell_text(td_by_class, 'kjTime'),
+            'code': _cell_text(td_by_class, 'kjCode'),
+            'name': _cell_text(td_by_class, 'kjName'),
+            'title': kj_title_str,
+            'pdf_url': pdf_url_str,
+            'xbrl_url': urllib.parse.urljoin('https://www.release.tdnet.info/inbs/', xbrl_a.get('href')),
+            'place': _cell_text(td_by_class, 'kjPlace'),
+            'history': _cell_text(td_by_class, 'kjHistroy')
+        }
+        xbrl_record_list.append(record)
+    
+    # 件数表示 (1～100件 / 全1048件 のような) から総件数を取得
+    total_count = None
+    for text in tree.itertext():
+        match = _RE_COUNT.search(text)
+        if match:
+            total_count = int(match.group(1))
+            break
+    
+    return xbrl_record_list, total_count
+
+
+# ダウンロード開始時刻の調整用（スレッド間で共有）
+_download_lock = threading.Lock()
+_next_download_at = 0.0
+
+
+def _wait_download_interval():
+    """前回のダウンロード開始からDOWNLOAD_INTERVAL秒経つまで待つ（スレッドセーフ）"""
+    
+    global _next_download_at
+    
+    # ロックを持ったまま待つことで、同時に待っているスレッドも1つずつ間隔を空けて開始する
+    with _download_lock:
+        now = time.monotonic()
+        if now < _next_download_at:
+            time.sleep(_next_download_at - now)
+            now = _next_download_at
+        _next_download_at = now + DOWNLOAD_INTERVAL
+
+
+def download_xbrl_bytes(url):
+    """
+    XBRLファイル（ZIP）をメモリ上にダウンロード
+    
+    Args:
+        url: XBRLファイルのURL
+    
+    Returns:
+        ファイルの内容（bytes）
+    
+    Raises:
+        requests.exceptions.RequestException: 通信エラー・HTTPエラーの場合
+        urllib3.exceptions.HTTPError: 受信途中の切断・タイムアウトの場合
+    """
+    
+    _wait_download_interval()
+    
+    with SESSION.get(url, stream=True, timeout=REQUEST_TIMEOUT) as response:
+        response.raise_for_status()
+        
+        # urllib3のストリームから大きなバッファでまとめて読み込む
+        response.raw.decode_content = True
+        buffer = io.BytesIO()
+        shutil.copyfileobj(response.raw, buffer, DOWNLOAD_CHUNK_SIZE)
+        return buffer.getvalue()
+
+
+def download_xbrl_file(url, save_dir="downloads", company_name="", code="", save_zip=True):
     """
     XBRLファイル（ZIP）をダウンロード
     
@@ -520,9 +918,10 @@ def download_xbrl_file(url, save_dir="downloads", company_name="", code=""):
         save_dir: 保存先ディレクトリ
         company_name: 会社名（ファイル名用）
         code: 証券コード（ファイル名用）
+        save_zip: ZIPファイル自体も保存するかどうか（Falseの場合はメモリ上で解凍のみ行う）
     
     Returns:
-        保存されたファイルパス（成功時）、None（失敗時）
+        保存されたファイルパス（成功時。save_zip=Falseの場合は解凍先ディレクトリ）、None（失敗時）
     """
     
     # 保存先ディレクトリを作成
@@ -544,22 +943,20 @@ def download_xbrl_file(url, save_dir="downloads", company_name="", code=""):
     
     try:
         print(f"ダウンロード中: {url}")
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
+        data = download_xbrl_bytes(url)
         
         # ファイルを保存
-        with open(file_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-        
-        print(f"  ✅ 保存完了: {file_path}")
+        if save_zip:
+            with open(file_path, 'wb') as f:
+                f.write(data)
+            print(f"  ✅ 保存完了: {file_path}")
         
-        # ZIPファイルを解凍
+        # ZIPファイルを解凍（保存したファイルを読み直さずメモリ上のデータから展開）
         if str(file_path).endswith('.zip'):
             extract_dir = save_path / f"{code}_{safe_name}" if company_name and code else save_path / original_filename.replace('.zip', '')
             extract_dir.mkdir(parents=True, exist_ok=True)
             
-            with zipfile.ZipFile(file_path, 'r') as zip_ref:
+            with zipfile.ZipFile(io.BytesIO(data), 'r') as zip_ref:
                 zip_ref.extractall(extract_dir)
                 print(f"  ✅ 解凍完了: {extract_dir}")
                 
@@ -568,15 +965,68 @@ def download_xbrl_file(url, save_dir="downloads", company_name="", code=""):
                 print(f"  解凍されたファイル数: {len(extracted_files)}")
                 for file in extracted_files[:5]:  # 最初の5ファイルを表示
                     print(f"    - {file.name}")
+            
+            if not save_zip:
+                return extract_dir
         
         return file_path
         
-    except requests.exceptions.RequestException as e:
+    except NETWORK_ERRORS as e:
         print(f"  ❌ ダウンロードエラー: {e}")
         return None
     except zipfile.BadZipFile as e:
         print(f"  ❌ ZIP解凍エラー: {e}")
-        return file_path  # ZIPファイル自体は保存されている
+        return file_path if save_zip else None  # ZIPファイル自体は保存されている
+
+
+def download_xbrl_files(records, save_dir="downloads", max_workers=DOWNLOAD_WORKERS, save_zip=True):
+    """
+    複数のXBRLファイル（ZIP）を並列にダウンロード
+    
+    Args:
+        records: XBRLレコードのリスト
+        save_dir: 保存先ディレクトリ
+        max_workers: 同時ダウンロード数の上限
+        save_zip: ZIPファイル自体も保存するかどうか
+    
+    Returns:
+        レコード順のダウンロード結果のリスト（download_xbrl_fileの戻り値）
+    """
+    
+    total = len(records)
+    
+    def download_one(numbered_record):
+        i, record = numbered_record
+        print(f"\n[{i}/{total}] {record['name']} ({record['code']})")
+        return download_xbrl_file(
+            record['xbrl_url'],
+            save_dir=save_dir,
+            company_name=record['name'],
+            code=record['code'],
+            save_zip=save_zip
+        )
+    
+    # ダウンロードはネットワーク待ちが大半のため、スレッドで重ねて実行する
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(download_one, enumerate(records, 1)))
+
+
+def _run_downloads(records, save_dir, save_zip=True) -> int:
+    """
+    レコードのXBRLファイルをまとめてダウンロードし、成功件数を返す
+    
+    Args:
+        records: ダウンロードするレコードのリスト
+        save_dir: 保存先ディレクトリ
+        save_zip: ZIPファイル自体も保存するかどうか
+    
+    Returns:
+        ダウンロードに成功した件数
+    """
+    
+    # 全件で共有のSESSION（接続プール）を使うため、どちらのモードでも接続を使い回せる
+    results = download_xbrl_files(records, save_dir=save_dir, save_zip=save_zip)
+    return sum(1 for result in results if result)
 
 
 def filter_records(records, filter_type="all"):
@@ -601,25 +1051,19 @@ def filter_records(records, filter_type="all"):
             # 決算短信を含むかチェック
             if '決算短信' in title:
                 # REITを除外
-                if 'ＲＥＩＴ' in title or 'リート' in title or 'REIT' in title:
+                if _RE_REIT_TITLE.search(title):
                     print(f"  除外: {r['name']} - {title} (REIT)")
                     continue
                     
                 # 訂正版・修正版を除外
-                exclude_keywords = [
-                    '訂正', '修正', 'データ訂正', '数値データ訂正',
-                    '一部訂正', '内容訂正', '記載内容訂正'
-                ]
-                
-                # 除外キーワードが含まれていないかチェック
-                if not any(keyword in title for keyword in exclude_keywords):
+                if not _RE_CORRECTION_TITLE.search(title):
                     filtered_records.append(r)
                 else:
                     print(f"  除外: {r['name']} - {title}")
         
         return filtered_records
     elif filter_type == "gyoseki":
-        return [r for r in records if '業績予想' in r['title'] or '業績の修正' in r['title']]
+        return [r for r in records if _RE_GYOSEKI_TITLE.search(r['title'])]
     else:
         return records
 
@@ -637,24 +1081,35 @@ def extract_financial_data(xbrl_file_path: str) -> Dict[str, Union[str, int, flo
     """
     
     try:
-        with open(xbrl_file_path, 'r', encoding='utf-8') as f:
-            soup = BeautifulSoup(f.read(), 'html.parser')
-        
-        financial_data = {
-            'company_info': {},
-            'income_statement': {},
-            'balance_sheet': {},
-            'metadata': {}
-        }
-        
-        # 基本情報の抽出
-        financial_data['company_info'] = _extract_company_info(soup)
+        with open(xbrl_file_path, 'rb') as f:
+            content = f.read()
         
-        # 損益計算書データの抽出
-        financial_data['income_statement'] = _extract_income_statement(soup)
+        # 同じ内容のファイルは前回の抽出結果を再利用
+        key = _extract_cache_key()
+        key.update(content)
+        cache_file = CACHE_DIR / 'financial' / f"{key.hexdigest()}.json"
+        financial_data = _read_lru_cache(cache_file)
         
-        # 貸借対照表データの抽出
-        financial_data['balance_sheet'] = _extract_balance_sheet(soup)
+        if financial_data is None:
+            index = _build_index(_parse_ixbrl(content))
+            
+            financial_data = {
+                'company_info': {},
+                'income_statement': {},
+                'balance_sheet': {},
+                'metadata': {}
+            }
+            
+            # 基本情報の抽出
+            financial_data['company_info'] = _extract_company_info(index)
+            
+            # 損益計算書データの抽出
+            financial_data['income_statement'] = _extract_income_statement(index)
+            
+            # 貸借対照表データの抽出
+            financial_data['balance_sheet'] = _extract_balance_sheet(index)
+            
+            _write_json_cache(cache_file, financial_data)
         
         # メタデータの設定
         financial_data['metadata'] = {
@@ -671,36 +1126,271 @@ def extract_financial_data(xbrl_file_path: str) -> Dict[str, Union[str, int, flo
         return {}
 
 
-def _extract_company_info(soup: BeautifulSoup) -> Dict[str, str]:
+def extract_financial_data_batch(xbrl_file_paths: List[str], max_workers: Optional[int] = EXTRACT_WORKERS) -> List[Dict]:
+    """
+    複数のXBRLファイルから財務データを並列に抽出
+    
+    Args:
+        xbrl_file_paths: XBRLファイルのパスのリスト
+        max_workers: 同時に実行するプロセス数の上限（NoneはCPUコア数）
+    
+    Returns:
+        入力順の財務データのリスト（extract_financial_dataの戻り値）
+    """
+    
+    return _process_map(extract_financial_data, xbrl_file_paths, max_workers=max_workers)
+
+
+def _process_map(func, *iterables, max_workers: Optional[int] = EXTRACT_WORKERS) -> List:
+    """
+    関数をプロセスプールで並列に適用（結果は入力順）
+    
+    Args:
+        func: 適用する関数（モジュールレベルの関数であること）
+        *iterables: 関数の引数のリスト
+        max_workers: 同時に実行するプロセス数の上限（NoneはCPUコア数）
+    
+    Returns:
+        入力順の結果のリスト
+    """
+    
+    return list(_process_imap(func, *iterables, max_workers=max_workers))
+
+
+def _process_imap(func, *iterables, max_workers: Optional[int] = EXTRACT_WORKERS) -> Iterator:
+    """
+    関数をプロセスプールで並列に適用し、結果を入力順に1件ずつ返す
+    
+    Args:
+        func: 適用する関数（モジュールレベルの関数であること）
+        *iterables: 関数の引数のリスト
+        max_workers: 同時に実行するプロセス数の上限（NoneはCPUコア数）
+    
+    Yields:
+        入力順の結果（受け取った結果は保持しないため、呼び出し側で逐次処理できる）
+    """
+    
+    args_list = list(zip(*iterables))
+    
+    # 解析はCPU処理が中心のため、GILの影響を受けないようプロセスで並列化する
+    if len(args_list) < 2 or max_workers == 1:
+        for args in args_list:
+            yield func(*args)
+        return
+    
+    # 件数より多いプロセスは起動せず、1プロセスあたり4回程度に分けてまとめて渡す（プロセス間通信を減らす）
+    workers = min(max_workers or os.cpu_count() or 1, len(args_list))
+    chunksize = max(1, len(args_list) // (workers * 4))
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(func, *zip(*args_list), chunksize=chunksize)
+
+
+def _raw_text(elem) -> str:
+    """要素のテキストを取得（子要素のない要素は子孫を辿らず直接のテキストを返す）"""
+    
+    # iXBRLのファクトはほぼテキストのみの葉要素なので、入れ子の場合だけ連結する
+    if len(elem) == 0:
+        return elem.text or ''
+    return elem.text_content()
+
+
+def _text(elem) -> str:
+    """要素のテキストを前後の空白を除いて取得"""
+    
+    return _raw_text(elem).strip()
+
+
+def _compact_text(elem) -> str:
+    """要素のテキストから改行・空白をすべて除いて取得（証券コード等）"""
+    
+    return _RE_WS.sub('', _raw_text(elem))
+
+
+def _parse_ixbrl(content: bytes):
+    """
+    iXBRL(.htm)ファイルの内容をlxmlで解析
+    
+    Args:
+        content: ファイルの内容（UTF-8のbytes）
+    
+    Returns:
+        ドキュメントのルート要素（lxml.html.HtmlElement）
+    """
+    
+    return lxml.html.document_fromstring(content, parser=_IXBRL_PARSER)
+
+
+def _build_index(tree: lxml.html.HtmlElement) -> XbrlIndex:
+    """
+    name属性を持つ要素の索引を一度の走査で作成
+    
+    Args:
+        tree: 解析済みのXBRL（iXBRL）ドキュメントのルート要素
+    
+    Returns:
+        (name, contextref) と (name, None) をキーとする要素の辞書
+        （文書中で最初に現れた要素を保持）
+    """
+    
+    return _index_elements(_XPATH_NAMED(tree))
+
+
+def _index_elements(elements: List[lxml.html.HtmlElement]) -> XbrlIndex:
+    """name属性を持つ要素のリスト（文書順）から索引を作成（_build_indexの本体）"""
+    
+    index = {}
+    for elem in elements:
+        name = elem.get('name')
+        index.setdefault((name, elem.get('contextref')), elem)
+        index.setdefault((name, None), elem)
+    
+    return index
+
+
+def _scan_htm_files(directory: str) -> List[os.DirEntry]:
+    """
+    ディレクトリ直下の.htmファイルを列挙（存在しない場合は空）
+    
+    Args:
+        directory: 対象ディレクトリのパス
+    
+    Returns:
+        .htmファイルのDirEntryのリスト（ディレクトリの列挙順）
+    """
+    
+    # Path.glob('*.htm')と同様に.で始まるファイルも対象（DirEntryは種別を持つため追加のstatは不要）
+    try:
+        with os.scandir(directory) as it:
+            return [entry for entry in it if entry.name.endswith('.htm') and entry.is_file()]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
+def _find_ixbrl_file(summary_dir: Path) -> Optional[Path]:
+    """
+    Summaryディレクトリから最初に見つかった*-ixbrl.htmファイルを取得
+    
+    Args:
+        summary_dir: Summaryディレクトリのパス
+    
+    Returns:
+        ixbrl.htmファイルのパス（見つからない場合はNone）
+    """
+    
+    # Path.globのように全件を集めず、最初に一致した時点で走査を打ち切る（globと同様に.で始まるファイルも対象）
+    try:
+        with os.scandir(summary_dir) as it:
+            return next((Path(entry.path) for entry in it if entry.name.endswith('-ixbrl.htm')), None)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _find_company_ixbrl(company_dir: Path) -> Tuple[Optional[Path], Optional[str]]:
+    """
+    企業ディレクトリのSummaryから解析対象のixbrl.htmファイルを探す
+    
+    Args:
+        company_dir: 企業ごとの解凍先ディレクトリ
+    
+    Returns:
+        (ixbrl.htmファイル or None, 見つからない場合のエラーメッセージ or None)
+    """
+    
+    summary_dir = company_dir / 'XBRLData' / 'Summary'
+    if not summary_dir.exists():
+        return None, "Summaryディレクトリが見つかりません"
+    
+    # 複数ある場合は最初に見つかったファイルを使用
+    ixbrl_file = _find_ixbrl_file(summary_dir)
+    if ixbrl_file is None:
+        return None, "ixbrl.htmファイルが見つかりません"
+    
+    return ixbrl_file, None
+
+
+def _attachment_path(company_dir: Path) -> Optional[str]:
+    """企業ディレクトリのAttachmentディレクトリのパスを取得（存在しない場合はNone）"""
+    
+    attachment_dir = company_dir / 'XBRLData' / 'Attachment'
+    return str(attachment_dir) if attachment_dir.exists() else None
+
+
+def _read_file_bytes(path: str) -> bytes:
+    """ファイルの内容をbytesで読み込む"""
+    
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _iter_file_bytes(paths: List[str], read_ahead: int = READ_AHEAD_FILES):
+    """
+    複数ファイルの内容を先読みしながら順に取得
+    
+    Args:
+        paths: 読み込むファイルのパスのリスト
+        read_ahead: 先読みするファイル数の上限
+    
+    Yields:
+        ファイルの内容（pathsの順）
+    """
+    
+    # 読み込みはGILを解放するため、呼び出し側が解析している間に次のファイルを読んでおく
+    with ThreadPoolExecutor(max_workers=read_ahead) as executor:
+        pending = deque()
+        for path in paths:
+            pending.append(executor.submit(_read_file_bytes, path))
+            if len(pending) > read_ahead:
+                yield pending.popleft().result()
+        
+        while pending:
+            yield pending.popleft().result()
+
+
+def _load_ixbrl(path) -> Tuple[List[lxml.html.HtmlElement], XbrlIndex]:
+    """
+    iXBRL(.htm)ファイルを読み込み、name属性を持つ要素と索引を取得
+    
+    Args:
+        path: iXBRLファイルのパス
+    
+    Returns:
+        (name属性を持つ全要素のリスト（文書順）, 索引) のタプル
+    """
+    
+    # 各Summaryファイルは企業ごとに一度しか読み込まないため、解析結果はメモリに保持しない
+    # 要素の取得は一度だけにし、索引の作成とtse-ed-t項目の自動抽出で同じリストを使う
+    named_elements = _XPATH_NAMED(_parse_ixbrl(_read_file_bytes(path)))
+    return named_elements, _index_elements(named_elements)
+
+
+def _extract_company_info(index: XbrlIndex) -> Dict[str, str]:
     """企業基本情報を抽出"""
     
     company_info = {}
     
     try:
         # 会社名（名前空間なしで検索）
-        company_name = soup.find(attrs={'name': 'tse-ed-t:CompanyName'})
-        if company_name:
-            company_info['company_name'] = company_name.get_text().strip()
+        company_name = index.get(('tse-ed-t:CompanyName', None))
+        if company_name is not None:
+            company_info['company_name'] = _text(company_name)
         
         # 証券コード
-        securities_code = soup.find(attrs={'name': 'tse-ed-t:SecuritiesCode'})
-        if securities_code:
-            text = securities_code.get_text().strip()
+        securities_code = index.get(('tse-ed-t:SecuritiesCode', None))
+        if securities_code is not None:
             # 改行や見えないdivを除去
-            import re
-            text = re.sub(r'\s+', '', text)
-            company_info['securities_code'] = text
+            company_info['securities_code'] = _compact_text(securities_code)
         
         # 提出日
-        filing_date = soup.find(attrs={'name': 'tse-ed-t:FilingDate'})
-        if filing_date:
-            raw_date = filing_date.get_text().strip()
+        filing_date = index.get(('tse-ed-t:FilingDate', None))
+        if filing_date is not None:
+            raw_date = _text(filing_date)
             company_info['filing_date'] = _format_date_to_iso(raw_date)
         
         # 決算期
-        document_name = soup.find(attrs={'name': 'tse-ed-t:DocumentName'})
-        if document_name:
-            company_info['document_name'] = document_name.get_text().strip()
+        document_name = index.get(('tse-ed-t:DocumentName', None))
+        if document_name is not None:
+            company_info['document_name'] = _text(document_name)
             
     except Exception as e:
         print(f"⚠️ 企業情報抽出エラー: {e}")
@@ -708,7 +1398,17 @@ def _extract_company_info(soup: BeautifulSoup) -> Dict[str, str]:
     return company_info
 
 
-def _extract_income_statement(soup: BeautifulSoup) -> Dict[str, Dict[str, float]]:
+# 抽出する項目の定義（(キー, XBRLタグ) の組）
+_BASIC_INCOME_ITEMS = (
+    ('net_sales', 'tse-ed-t:NetSales'),
+    ('operating_income', 'tse-ed-t:OperatingIncome'),
+    ('ordinary_income', 'tse-ed-t:OrdinaryIncome'),
+    ('profit_attributable_to_owners', 'tse-ed-t:ProfitAttributableToOwnersOfParent'),
+    ('comprehensive_income', 'tse-ed-t:ComprehensiveIncome')
+)
+
+
+def _extract_income_statement(index: XbrlIndex) -> Dict[str, Dict[str, float]]:
     """損益計算書データを抽出"""
     
     income_data = {
@@ -716,27 +1416,18 @@ def _extract_income_statement(soup: BeautifulSoup) -> Dict[str, Dict[str, float]
         'prior_year': {}
     }
     
-    # 抽出する項目の定義
-    income_items = {
-        'net_sales': 'tse-ed-t:NetSales',
-        'operating_income': 'tse-ed-t:OperatingIncome', 
-        'ordinary_income': 'tse-ed-t:OrdinaryIncome',
-        'profit_attributable_to_owners': 'tse-ed-t:ProfitAttributableToOwnersOfParent',
-        'comprehensive_income': 'tse-ed-t:ComprehensiveIncome'
-    }
-    
     try:
-        for item_key, xbrl_tag in income_items.items():
+        for item_key, xbrl_tag in _BASIC_INCOME_ITEMS:
             # 当期データ
-            current_elem = soup.find(attrs={'name': xbrl_tag, 'contextref': 'CurrentYearDuration_ConsolidatedMember_ResultMember'})
-            if current_elem:
+            current_elem = index.get((xbrl_tag, 'CurrentYearDuration_ConsolidatedMember_ResultMember'))
+            if current_elem is not None:
                 value = _parse_financial_value(current_elem)
                 if value is not None:
                     income_data['current_year'][item_key] = value
             
             # 前期データ
-            prior_elem = soup.find(attrs={'name': xbrl_tag, 'contextref': 'PriorYearDuration_ConsolidatedMember_ResultMember'})
-            if prior_elem:
+            prior_elem = index.get((xbrl_tag, 'PriorYearDuration_ConsolidatedMember_ResultMember'))
+            if prior_elem is not None:
                 value = _parse_financial_value(prior_elem)
                 if value is not None:
                     income_data['prior_year'][item_key] = value
@@ -747,7 +1438,15 @@ def _extract_income_statement(soup: BeautifulSoup) -> Dict[str, Dict[str, float]
     return income_data
 
 
-def _extract_balance_sheet(soup: BeautifulSoup) -> Dict[str, Dict[str, float]]:
+# 抽出する項目の定義（決算短信から直接取得可能な項目、(キー, XBRLタグ) の組）
+_BASIC_BALANCE_ITEMS = (
+    ('total_assets', 'tse-ed-t:TotalAssets'),
+    ('net_assets', 'tse-ed-t:NetAssets'),
+    ('owners_equity', 'tse-ed-t:OwnersEquity')
+)
+
+
+def _extract_balance_sheet(index: XbrlIndex) -> Dict[str, Dict[str, float]]:
     """貸借対照表データを抽出"""
     
     balance_data = {
@@ -755,25 +1454,18 @@ def _extract_balance_sheet(soup: BeautifulSoup) -> Dict[str, Dict[str, float]]:
         'prior_year': {}
     }
     
-    # 抽出する項目の定義（決算短信から直接取得可能な項目）
-    balance_items = {
-        'total_assets': 'tse-ed-t:TotalAssets',
-        'net_assets': 'tse-ed-t:NetAssets', 
-        'owners_equity': 'tse-ed-t:OwnersEquity'
-    }
-    
     try:
-        for item_key, xbrl_tag in balance_items.items():
+        for item_key, xbrl_tag in _BASIC_BALANCE_ITEMS:
             # 当期末データ
-            current_elem = soup.find(attrs={'name': xbrl_tag, 'contextref': 'CurrentYearInstant_ConsolidatedMember_ResultMember'})
-            if current_elem:
+            current_elem = index.get((xbrl_tag, 'CurrentYearInstant_ConsolidatedMember_ResultMember'))
+            if current_elem is not None:
                 value = _parse_financial_value(current_elem)
                 if value is not None:
                     balance_data['current_year'][item_key] = value
             
             # 前期末データ
-            prior_elem = soup.find(attrs={'name': xbrl_tag, 'contextref': 'PriorYearInstant_ConsolidatedMember_ResultMember'})
-            if prior_elem:
+            prior_elem = index.get((xbrl_tag, 'PriorYearInstant_ConsolidatedMember_ResultMember'))
+            if prior_elem is not None:
                 value = _parse_financial_value(prior_elem)
                 if value is not None:
                     balance_data['prior_year'][item_key] = value
@@ -784,9 +1476,10 @@ def _extract_balance_sheet(soup: BeautifulSoup) -> Dict[str, Dict[str, float]]:
     return balance_data
 
 
+@functools.lru_cache(maxsize=1024)
 def _format_date_to_iso(date_str: str) -> str:
     """
-    様々な形式の日付文字列をyyyy-mm-dd形式に変換
+    様々な形式の日付文字列をyyyy-mm-dd形式に変換（同じ文字列の2回目以降はキャッシュから返す）
     
     Args:
         date_str: 日付文字列（例：「2025年8月19日」「2025-08-19」「20250819」）
@@ -794,14 +1487,15 @@ def _format_date_to_iso(date_str: str) -> str:
     Returns:
         yyyy-mm-dd形式の文字列
     """
-    import unicodedata
-    import re
     
     if not date_str:
         return ''
     
     # Unicode正規化で全角・半角文字を統一（NFKC形式）
-    normalized_str = unicodedata.normalize('NFKC', date_str.strip())
+    # ASCIIのみの文字列は正規化しても変わらないため省略する（XBRLの日付の大半）
+    normalized_str = date_str.strip()
+    if not normalized_str.isascii():
+        normalized_str = unicodedata.normalize('NFKC', normalized_str)
     
     # 既にyyyy-mm-dd形式の場合はそのまま返す
     if len(normalized_str) == 10 and normalized_str.count('-') == 2:
@@ -813,81 +1507,74 @@ def _format_date_to_iso(date_str: str) -> str:
     
     # 日本語形式の日付を処理（例：「2025年8月19日」）
     # 正規化後の文字列で再パターンマッチ
-    japanese_date_match = re.match(r'(\d{4})年(\d{1,2})月(\d{1,2})日', normalized_str)
+    japanese_date_match = _RE_JP_DATE.match(normalized_str)
     if japanese_date_match:
         year, month, day = japanese_date_match.groups()
         return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
     
     # その他の形式も試行
-    try:
-        from datetime import datetime
-        # 複数の日付形式を試す
-        formats = ['%Y/%m/%d', '%Y.%m.%d', '%Y-%m-%d', '%m/%d/%Y']
-        for fmt in formats:
-            try:
-                dt = datetime.strptime(normalized_str, fmt)
-                return dt.strftime('%Y-%m-%d')
-            except ValueError:
-                continue
-    except:
-        pass
+    # 複数の日付形式を試す
+    formats = ['%Y/%m/%d', '%Y.%m.%d', '%Y-%m-%d', '%m/%d/%Y']
+    for fmt in formats:
+        try:
+            dt = datetime.strptime(normalized_str, fmt)
+            return dt.strftime('%Y-%m-%d')
+        except ValueError:
+            continue
     
     # 変換できない場合は正規化された文字列を返す
     return normalized_str
 
-def _extract_comprehensive_company_info(soup: BeautifulSoup) -> Dict[str, str]:
+# 複数タクソノミに対応した企業情報項目の定義（(キー, XBRLタグ) の組）
+_COMPANY_TAXONOMIES = (
+    # 一般事業会社（日本基準・IFRS）
+    (
+        ('company_name', 'tse-ed-t:CompanyName'),
+        ('securities_code', 'tse-ed-t:SecuritiesCode'),
+        ('document_name', 'tse-ed-t:DocumentName'),
+        ('representative_title', 'tse-ed-t:TitleRepresentative'),
+        ('representative_name', 'tse-ed-t:NameRepresentative'),
+        ('inquiries_title', 'tse-ed-t:TitleInquiries'),
+        ('inquiries_name', 'tse-ed-t:NameInquiries'),
+        ('tel', 'tse-ed-t:Tel'),
+        ('url', 'tse-ed-t:URL')
+    ),
+    # REIT（不動産投資信託）
+    (
+        ('company_name', 'tse-re-t:IssuerNameREIT'),
+        ('securities_code', 'tse-re-t:SecuritiesCode'),
+        ('document_name', 'tse-re-t:DocumentName'),
+        ('representative_title', 'tse-re-t:TitleRepresentative'),
+        ('representative_name', 'tse-re-t:NameRepresentative'),
+        ('inquiries_title', 'tse-re-t:TitleInquiries'),
+        ('inquiries_name', 'tse-re-t:NameInquiries'),
+        ('tel', 'tse-re-t:Tel'),
+        ('url', 'tse-re-t:URL')
+    )
+)
+
+
+def _extract_comprehensive_company_info(index: XbrlIndex) -> Dict[str, str]:
     """企業基本情報を包括的に抽出（複数タクソノミ対応）"""
     
     company_data = {}
     
-    # 複数タクソノミに対応した企業情報項目の定義
-    company_item_mappings = [
-        # 一般事業会社（日本基準・IFRS）
-        {
-            'company_name': ['tse-ed-t:CompanyName'],
-            'securities_code': ['tse-ed-t:SecuritiesCode'],
-            'document_name': ['tse-ed-t:DocumentName'],
-            'representative_title': ['tse-ed-t:TitleRepresentative'],
-            'representative_name': ['tse-ed-t:NameRepresentative'],
-            'inquiries_title': ['tse-ed-t:TitleInquiries'],
-            'inquiries_name': ['tse-ed-t:NameInquiries'],
-            'tel': ['tse-ed-t:Tel'],
-            'url': ['tse-ed-t:URL']
-        },
-        # REIT（不動産投資信託）
-        {
-            'company_name': ['tse-re-t:IssuerNameREIT'],
-            'securities_code': ['tse-re-t:SecuritiesCode'],
-            'document_name': ['tse-re-t:DocumentName'],
-            'representative_title': ['tse-re-t:TitleRepresentative'],
-            'representative_name': ['tse-re-t:NameRepresentative'],
-            'inquiries_title': ['tse-re-t:TitleInquiries'],
-            'inquiries_name': ['tse-re-t:NameInquiries'],
-            'tel': ['tse-re-t:Tel'],
-            'url': ['tse-re-t:URL']
-        }
-    ]
-    
     try:
         # 各タクソノミを順番に試す
-        for mapping in company_item_mappings:
+        for taxonomy in _COMPANY_TAXONOMIES:
             found_data = False
             temp_data = {}
             
-            for key, xbrl_tags in mapping.items():
-                for xbrl_tag in xbrl_tags:
-                    elem = soup.find(attrs={'name': xbrl_tag})
-                    if elem:
-                        value = elem.get_text().strip()
-                        if key == 'securities_code':
-                            import re
-                            value = re.sub(r'\s+', '', value)
-                        temp_data[key] = value
-                        found_data = True
-                        break
-                
-                # データが見つからない場合は空文字を設定
-                if key not in temp_data:
+            for key, xbrl_tag in taxonomy:
+                elem = index.get((xbrl_tag, None))
+                if elem is not None:
+                    if key == 'securities_code':
+                        temp_data[key] = _compact_text(elem)
+                    else:
+                        temp_data[key] = _text(elem)
+                    found_data = True
+                else:
+                    # データが見つからない場合は空文字を設定
                     temp_data[key] = ''
             
             # いずれかのタクソノミでデータが見つかった場合は採用
@@ -897,9 +1584,7 @@ def _extract_comprehensive_company_info(soup: BeautifulSoup) -> Dict[str, str]:
         
         # どのタクソノミでもデータが見つからない場合
         if not company_data:
-            for key in ['company_name', 'securities_code', 'document_name', 
-                       'representative_title', 'representative_name', 
-                       'inquiries_title', 'inquiries_name', 'tel', 'url']:
+            for key, _ in _COMPANY_TAXONOMIES[0]:
                 company_data[key] = ''
                 
     except Exception as e:
@@ -907,32 +1592,32 @@ def _extract_comprehensive_company_info(soup: BeautifulSoup) -> Dict[str, str]:
     
     return company_data
 
+# 損益計算書項目の定義（(キー, XBRLタグ, コンテキスト) の組）
+_INCOME_ITEMS = (
+    ('net_sales_current', 'tse-ed-t:NetSales', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
+    ('net_sales_prior', 'tse-ed-t:NetSales', 'PriorYearDuration_ConsolidatedMember_ResultMember'),
+    ('operating_income_current', 'tse-ed-t:OperatingIncome', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
+    ('operating_income_prior', 'tse-ed-t:OperatingIncome', 'PriorYearDuration_ConsolidatedMember_ResultMember'),
+    ('ordinary_income_current', 'tse-ed-t:OrdinaryIncome', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
+    ('ordinary_income_prior', 'tse-ed-t:OrdinaryIncome', 'PriorYearDuration_ConsolidatedMember_ResultMember'),
+    ('profit_attributable_to_owners_current', 'tse-ed-t:ProfitAttributableToOwnersOfParent', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
+    ('profit_attributable_to_owners_prior', 'tse-ed-t:ProfitAttributableToOwnersOfParent', 'PriorYearDuration_ConsolidatedMember_ResultMember'),
+    ('comprehensive_income_current', 'tse-ed-t:ComprehensiveIncome', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
+    ('comprehensive_income_prior', 'tse-ed-t:ComprehensiveIncome', 'PriorYearDuration_ConsolidatedMember_ResultMember'),
+    ('investment_profit_loss_current', 'tse-ed-t:InvestmentProfitLossOnEquityMethod', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
+    ('investment_profit_loss_prior', 'tse-ed-t:InvestmentProfitLossOnEquityMethod', 'PriorYearDuration_ConsolidatedMember_ResultMember')
+)
+
 
-def _extract_comprehensive_income_statement(soup: BeautifulSoup) -> Dict[str, float]:
+def _extract_comprehensive_income_statement(index: XbrlIndex) -> Dict[str, float]:
     """損益計算書を包括的に抽出"""
     
     income_data = {}
     
-    # 損益計算書項目の定義
-    income_items = {
-        'net_sales_current': ('tse-ed-t:NetSales', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
-        'net_sales_prior': ('tse-ed-t:NetSales', 'PriorYearDuration_ConsolidatedMember_ResultMember'),
-        'operating_income_current': ('tse-ed-t:OperatingIncome', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
-        'operating_income_prior': ('tse-ed-t:OperatingIncome', 'PriorYearDuration_ConsolidatedMember_ResultMember'),
-        'ordinary_income_current': ('tse-ed-t:OrdinaryIncome', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
-        'ordinary_income_prior': ('tse-ed-t:OrdinaryIncome', 'PriorYearDuration_ConsolidatedMember_ResultMember'),
-        'profit_attributable_to_owners_current': ('tse-ed-t:ProfitAttributableToOwnersOfParent', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
-        'profit_attributable_to_owners_prior': ('tse-ed-t:ProfitAttributableToOwnersOfParent', 'PriorYearDuration_ConsolidatedMember_ResultMember'),
-        'comprehensive_income_current': ('tse-ed-t:ComprehensiveIncome', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
-        'comprehensive_income_prior': ('tse-ed-t:ComprehensiveIncome', 'PriorYearDuration_ConsolidatedMember_ResultMember'),
-        'investment_profit_loss_current': ('tse-ed-t:InvestmentProfitLossOnEquityMethod', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
-        'investment_profit_loss_prior': ('tse-ed-t:InvestmentProfitLossOnEquityMethod', 'PriorYearDuration_ConsolidatedMember_ResultMember')
-    }
-    
     try:
-        for key, (xbrl_tag, context) in income_items.items():
-            elem = soup.find(attrs={'name': xbrl_tag, 'contextref': context})
-            if elem:
+        for key, xbrl_tag, context in _INCOME_ITEMS:
+            elem = index.get((xbrl_tag, context))
+            if elem is not None:
                 value = _parse_financial_value(elem)
                 if value is not None:
                     income_data[key] = value
@@ -945,25 +1630,26 @@ def _extract_comprehensive_income_statement(soup: BeautifulSoup) -> Dict[str, fl
     return income_data
 
 
-def _extract_comprehensive_balance_sheet(soup: BeautifulSoup) -> Dict[str, float]:
+# 貸借対照表項目の定義（(キー, XBRLタグ, コンテキスト) の組）
+_BALANCE_ITEMS = (
+    ('total_assets_current', 'tse-ed-t:TotalAssets', 'CurrentYearInstant_ConsolidatedMember_ResultMember'),
+    ('total_assets_prior', 'tse-ed-t:TotalAssets', 'PriorYearInstant_ConsolidatedMember_ResultMember'),
+    ('net_assets_current', 'tse-ed-t:NetAssets', 'CurrentYearInstant_ConsolidatedMember_ResultMember'),
+    ('net_assets_prior', 'tse-ed-t:NetAssets', 'PriorYearInstant_ConsolidatedMember_ResultMember'),
+    ('owners_equity_current', 'tse-ed-t:OwnersEquity', 'CurrentYearInstant_ConsolidatedMember_ResultMember'),
+    ('owners_equity_prior', 'tse-ed-t:OwnersEquity', 'PriorYearInstant_ConsolidatedMember_ResultMember')
+)
+
+
+def _extract_comprehensive_balance_sheet(index: XbrlIndex) -> Dict[str, float]:
     """貸借対照表を包括的に抽出"""
     
     balance_data = {}
     
-    # 貸借対照表項目の定義
-    balance_items = {
-        'total_assets_current': ('tse-ed-t:TotalAssets', 'CurrentYearInstant_ConsolidatedMember_ResultMember'),
-        'total_assets_prior': ('tse-ed-t:TotalAssets', 'PriorYearInstant_ConsolidatedMember_ResultMember'),
-        'net_assets_current': ('tse-ed-t:NetAssets', 'CurrentYearInstant_ConsolidatedMember_ResultMember'),
-        'net_assets_prior': ('tse-ed-t:NetAssets', 'PriorYearInstant_ConsolidatedMember_ResultMember'),
-        'owners_equity_current': ('tse-ed-t:OwnersEquity', 'CurrentYearInstant_ConsolidatedMember_ResultMember'),
-        'owners_equity_prior': ('tse-ed-t:OwnersEquity', 'PriorYearInstant_ConsolidatedMember_ResultMember')
-    }
-    
     try:
-        for key, (xbrl_tag, context) in balance_items.items():
-            elem = soup.find(attrs={'name': xbrl_tag, 'contextref': context})
-            if elem:
+        for key, xbrl_tag, context in _BALANCE_ITEMS:
+            elem = index.get((xbrl_tag, context))
+            if elem is not None:
                 value = _parse_financial_value(elem)
                 if value is not None:
                     balance_data[key] = value
@@ -976,27 +1662,28 @@ def _extract_comprehensive_balance_sheet(soup: BeautifulSoup) -> Dict[str, float
     return balance_data
 
 
-def _extract_cash_flow_data(soup: BeautifulSoup) -> Dict[str, float]:
+# キャッシュフロー項目の定義（(キー, XBRLタグ, コンテキスト) の組）
+_CF_ITEMS = (
+    ('operating_cash_flow_current', 'tse-ed-t:CashFlowsFromOperatingActivities', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
+    ('operating_cash_flow_prior', 'tse-ed-t:CashFlowsFromOperatingActivities', 'PriorYearDuration_ConsolidatedMember_ResultMember'),
+    ('investing_cash_flow_current', 'tse-ed-t:CashFlowsFromInvestingActivities', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
+    ('investing_cash_flow_prior', 'tse-ed-t:CashFlowsFromInvestingActivities', 'PriorYearDuration_ConsolidatedMember_ResultMember'),
+    ('financing_cash_flow_current', 'tse-ed-t:CashFlowsFromFinancingActivities', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
+    ('financing_cash_flow_prior', 'tse-ed-t:CashFlowsFromFinancingActivities', 'PriorYearDuration_ConsolidatedMember_ResultMember'),
+    ('cash_and_equivalents_current', 'tse-ed-t:CashAndEquivalentsEndOfPeriod', 'CurrentYearInstant_ConsolidatedMember_ResultMember'),
+    ('cash_and_equivalents_prior', 'tse-ed-t:CashAndEquivalentsEndOfPeriod', 'PriorYearInstant_ConsolidatedMember_ResultMember')
+)
+
+
+def _extract_cash_flow_data(index: XbrlIndex) -> Dict[str, float]:
     """キャッシュフローデータを抽出"""
     
     cf_data = {}
     
-    # キャッシュフロー項目の定義
-    cf_items = {
-        'operating_cash_flow_current': ('tse-ed-t:CashFlowsFromOperatingActivities', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
-        'operating_cash_flow_prior': ('tse-ed-t:CashFlowsFromOperatingActivities', 'PriorYearDuration_ConsolidatedMember_ResultMember'),
-        'investing_cash_flow_current': ('tse-ed-t:CashFlowsFromInvestingActivities', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
-        'investing_cash_flow_prior': ('tse-ed-t:CashFlowsFromInvestingActivities', 'PriorYearDuration_ConsolidatedMember_ResultMember'),
-        'financing_cash_flow_current': ('tse-ed-t:CashFlowsFromFinancingActivities', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
-        'financing_cash_flow_prior': ('tse-ed-t:CashFlowsFromFinancingActivities', 'PriorYearDuration_ConsolidatedMember_ResultMember'),
-        'cash_and_equivalents_current': ('tse-ed-t:CashAndEquivalentsEndOfPeriod', 'CurrentYearInstant_ConsolidatedMember_ResultMember'),
-        'cash_and_equivalents_prior': ('tse-ed-t:CashAndEquivalentsEndOfPeriod', 'PriorYearInstant_ConsolidatedMember_ResultMember')
-    }
-    
     try:
-        for key, (xbrl_tag, context) in cf_items.items():
-            elem = soup.find(attrs={'name': xbrl_tag, 'contextref': context})
-            if elem:
+        for key, xbrl_tag, context in _CF_ITEMS:
+            elem = index.get((xbrl_tag, context))
+            if elem is not None:
                 value = _parse_financial_value(elem)
                 if value is not None:
                     cf_data[key] = value
@@ -1009,34 +1696,35 @@ def _extract_cash_flow_data(soup: BeautifulSoup) -> Dict[str, float]:
     return cf_data
 
 
-def _extract_ratios_and_indicators(soup: BeautifulSoup) -> Dict[str, float]:
+# 比率・指標項目の定義（(キー, XBRLタグ, コンテキスト) の組）
+_RATIO_ITEMS = (
+    ('eps_current', 'tse-ed-t:NetIncomePerShare', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
+    ('eps_prior', 'tse-ed-t:NetIncomePerShare', 'PriorYearDuration_ConsolidatedMember_ResultMember'),
+    ('bps_current', 'tse-ed-t:NetAssetsPerShare', 'CurrentYearInstant_ConsolidatedMember_ResultMember'),
+    ('bps_prior', 'tse-ed-t:NetAssetsPerShare', 'PriorYearInstant_ConsolidatedMember_ResultMember'),
+    ('roe_current', 'tse-ed-t:NetIncomeToShareholdersEquityRatio', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
+    ('roe_prior', 'tse-ed-t:NetIncomeToShareholdersEquityRatio', 'PriorYearDuration_ConsolidatedMember_ResultMember'),
+    ('roa_current', 'tse-ed-t:OrdinaryIncomeToTotalAssetsRatio', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
+    ('roa_prior', 'tse-ed-t:OrdinaryIncomeToTotalAssetsRatio', 'PriorYearDuration_ConsolidatedMember_ResultMember'),
+    ('operating_margin_current', 'tse-ed-t:OperatingIncomeToNetSalesRatio', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
+    ('operating_margin_prior', 'tse-ed-t:OperatingIncomeToNetSalesRatio', 'PriorYearDuration_ConsolidatedMember_ResultMember'),
+    ('equity_ratio_current', 'tse-ed-t:CapitalAdequacyRatio', 'CurrentYearInstant_ConsolidatedMember_ResultMember'),
+    ('equity_ratio_prior', 'tse-ed-t:CapitalAdequacyRatio', 'PriorYearInstant_ConsolidatedMember_ResultMember'),
+    ('payout_ratio_current', 'tse-ed-t:PayoutRatio', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
+    ('average_shares_current', 'tse-ed-t:AverageNumberOfShares', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
+    ('issued_shares_current', 'tse-ed-t:NumberOfIssuedAndOutstandingSharesAtTheEndOfFiscalYearIncludingTreasuryStock', 'CurrentYearInstant_ConsolidatedMember_ResultMember')
+)
+
+
+def _extract_ratios_and_indicators(index: XbrlIndex) -> Dict[str, float]:
     """比率・指標データを抽出"""
     
     ratio_data = {}
     
-    # 比率・指標項目の定義
-    ratio_items = {
-        'eps_current': ('tse-ed-t:NetIncomePerShare', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
-        'eps_prior': ('tse-ed-t:NetIncomePerShare', 'PriorYearDuration_ConsolidatedMember_ResultMember'),
-        'bps_current': ('tse-ed-t:NetAssetsPerShare', 'CurrentYearInstant_ConsolidatedMember_ResultMember'),
-        'bps_prior': ('tse-ed-t:NetAssetsPerShare', 'PriorYearInstant_ConsolidatedMember_ResultMember'),
-        'roe_current': ('tse-ed-t:NetIncomeToShareholdersEquityRatio', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
-        'roe_prior': ('tse-ed-t:NetIncomeToShareholdersEquityRatio', 'PriorYearDuration_ConsolidatedMember_ResultMember'),
-        'roa_current': ('tse-ed-t:OrdinaryIncomeToTotalAssetsRatio', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
-        'roa_prior': ('tse-ed-t:OrdinaryIncomeToTotalAssetsRatio', 'PriorYearDuration_ConsolidatedMember_ResultMember'),
-        'operating_margin_current': ('tse-ed-t:OperatingIncomeToNetSalesRatio', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
-        'operating_margin_prior': ('tse-ed-t:OperatingIncomeToNetSalesRatio', 'PriorYearDuration_ConsolidatedMember_ResultMember'),
-        'equity_ratio_current': ('tse-ed-t:CapitalAdequacyRatio', 'CurrentYearInstant_ConsolidatedMember_ResultMember'),
-        'equity_ratio_prior': ('tse-ed-t:CapitalAdequacyRatio', 'PriorYearInstant_ConsolidatedMember_ResultMember'),
-        'payout_ratio_current': ('tse-ed-t:PayoutRatio', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
-        'average_shares_current': ('tse-ed-t:AverageNumberOfShares', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
-        'issued_shares_current': ('tse-ed-t:NumberOfIssuedAndOutstandingSharesAtTheEndOfFiscalYearIncludingTreasuryStock', 'CurrentYearInstant_ConsolidatedMember_ResultMember')
-    }
-    
     try:
-        for key, (xbrl_tag, context) in ratio_items.items():
-            elem = soup.find(attrs={'name': xbrl_tag, 'contextref': context})
-            if elem:
+        for key, xbrl_tag, context in _RATIO_ITEMS:
+            elem = index.get((xbrl_tag, context))
+            if elem is not None:
                 value = _parse_financial_value(elem)
                 if value is not None:
                     ratio_data[key] = value
@@ -1049,26 +1737,27 @@ def _extract_ratios_and_indicators(soup: BeautifulSoup) -> Dict[str, float]:
     return ratio_data
 
 
-def _extract_dividend_and_share_info(soup: BeautifulSoup) -> Dict[str, Union[float, str]]:
+# 配当・株式項目の定義（(キー, XBRLタグ, コンテキスト) の組）
+_DIVIDEND_ITEMS = (
+    ('dividend_per_share_current', 'tse-ed-t:DividendPerShare', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
+    ('total_dividend_current', 'tse-ed-t:TotalDividendPaidAnnual', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
+    ('shareholder_meeting_date', 'tse-ed-t:DateOfGeneralShareholdersMeetingAsPlanned', 'CurrentYearInstant'),
+    ('dividend_payment_date', 'tse-ed-t:DividendPayableDateAsPlanned', 'CurrentYearInstant'),
+    ('securities_report_date', 'tse-ed-t:AnnualSecuritiesReportFilingDateAsPlanned', 'CurrentYearInstant')
+)
+
+
+def _extract_dividend_and_share_info(index: XbrlIndex) -> Dict[str, Union[float, str]]:
     """配当・株式情報を抽出"""
     
     dividend_data = {}
     
-    # 配当・株式項目の定義
-    dividend_items = {
-        'dividend_per_share_current': ('tse-ed-t:DividendPerShare', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
-        'total_dividend_current': ('tse-ed-t:TotalDividendPaidAnnual', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
-        'shareholder_meeting_date': ('tse-ed-t:DateOfGeneralShareholdersMeetingAsPlanned', 'CurrentYearInstant'),
-        'dividend_payment_date': ('tse-ed-t:DividendPayableDateAsPlanned', 'CurrentYearInstant'),
-        'securities_report_date': ('tse-ed-t:AnnualSecuritiesReportFilingDateAsPlanned', 'CurrentYearInstant')
-    }
-    
     try:
-        for key, (xbrl_tag, context) in dividend_items.items():
-            elem = soup.find(attrs={'name': xbrl_tag, 'contextref': context})
-            if elem:
+        for key, xbrl_tag, context in _DIVIDEND_ITEMS:
+            elem = index.get((xbrl_tag, context))
+            if elem is not None:
                 if 'date' in key:
-                    raw_date = elem.get_text().strip()
+                    raw_date = _text(elem)
                     dividend_data[key] = _format_date_to_iso(raw_date)
                 else:
                     value = _parse_financial_value(elem)
@@ -1083,28 +1772,29 @@ def _extract_dividend_and_share_info(soup: BeautifulSoup) -> Dict[str, Union[flo
     return dividend_data
 
 
-def _extract_other_important_items(soup: BeautifulSoup) -> Dict[str, Union[float, str]]:
+# その他重要項目の定義（(キー, XBRLタグ, コンテキスト) の組）
+_OTHER_ITEMS = (
+    ('fiscal_year_end', 'tse-ed-t:FiscalYearEnd', 'CurrentYearInstant'),
+    ('treasury_stock_count', 'tse-ed-t:NumberOfTreasuryStockAtTheEndOfFiscalYear', 'CurrentYearInstant_NonConsolidatedMember_ResultMember'),
+    ('new_subsidiaries_count', 'tse-ed-t:NumberOfSubsidiariesNewlyConsolidated', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
+    ('new_subsidiaries_names', 'tse-ed-t:NameOfSubsidiariesNewlyConsolidated', 'CurrentYearDuration_ConsolidatedMember_ResultMember')
+)
+
+
+def _extract_other_important_items(index: XbrlIndex) -> Dict[str, Union[float, str]]:
     """その他重要項目を抽出"""
     
     other_data = {}
     
-    # その他重要項目の定義
-    other_items = {
-        'fiscal_year_end': ('tse-ed-t:FiscalYearEnd', 'CurrentYearInstant'),
-        'treasury_stock_count': ('tse-ed-t:NumberOfTreasuryStockAtTheEndOfFiscalYear', 'CurrentYearInstant_NonConsolidatedMember_ResultMember'),
-        'new_subsidiaries_count': ('tse-ed-t:NumberOfSubsidiariesNewlyConsolidated', 'CurrentYearDuration_ConsolidatedMember_ResultMember'),
-        'new_subsidiaries_names': ('tse-ed-t:NameOfSubsidiariesNewlyConsolidated', 'CurrentYearDuration_ConsolidatedMember_ResultMember')
-    }
-    
     try:
-        for key, (xbrl_tag, context) in other_items.items():
-            elem = soup.find(attrs={'name': xbrl_tag, 'contextref': context})
-            if elem:
+        for key, xbrl_tag, context in _OTHER_ITEMS:
+            elem = index.get((xbrl_tag, context))
+            if elem is not None:
                 if key in ['fiscal_year_end']:
-                    raw_date = elem.get_text().strip()
+                    raw_date = _text(elem)
                     other_data[key] = _format_date_to_iso(raw_date)
                 elif key in ['new_subsidiaries_names']:
-                    other_data[key] = elem.get_text().strip()
+                    other_data[key] = _text(elem)
                 else:
                     value = _parse_financial_value(elem)
                     if value is not None:
@@ -1118,48 +1808,133 @@ def _extract_other_important_items(soup: BeautifulSoup) -> Dict[str, Union[float
     return other_data
 
 
-def _extract_detailed_financial_data(attachment_dir_path: str) -> Dict[str, float]:
-    """詳細財務諸表データを抽出（Attachmentフォルダから）"""
+@functools.lru_cache(maxsize=256)
+def _jppfs_context_suffix(context: str) -> str:
+    """jppfs_cor項目のキーに付けるサフィックスをコンテキストIDから決定（コンテキストIDごとにキャッシュ）"""
+    
+    if 'CurrentYearInstant' in context:
+        return '_current'
+    elif 'Prior1YearInstant' in context or 'PriorYearInstant' in context:
+        return '_prior'
+    elif 'CurrentYearDuration' in context:
+        return '_duration_current'
+    elif 'PriorYearDuration' in context:
+        return '_duration_prior'
+    return ''
+
+
+# jppfs_cor名前空間の主要項目（貸借対照表ファイル acbs01 から抽出、(キー, XBRLタグ, コンテキスト) の組）
+_DETAILED_ITEMS = (
+    ('cash_and_deposits_current', 'jppfs_cor:CashAndDeposits', 'CurrentYearInstant'),
+    ('cash_and_deposits_prior', 'jppfs_cor:CashAndDeposits', 'Prior1YearInstant'),
+    ('accounts_receivable_current', 'jppfs_cor:NotesAndAccountsReceivableTradeAndContractAssets', 'CurrentYearInstant'),
+    ('accounts_receivable_prior', 'jppfs_cor:NotesAndAccountsReceivableTradeAndContractAssets', 'Prior1YearInstant'),
+    ('inventory_current', 'jppfs_cor:MerchandiseAndFinishedGoods', 'CurrentYearInstant'),
+    ('inventory_prior', 'jppfs_cor:MerchandiseAndFinishedGoods', 'Prior1YearInstant'),
+    ('work_in_process_current', 'jppfs_cor:WorkInProcess', 'CurrentYearInstant'),
+    ('work_in_process_prior', 'jppfs_cor:WorkInProcess', 'Prior1YearInstant'),
+    ('raw_materials_current', 'jppfs_cor:RawMaterialsAndSupplies', 'CurrentYearInstant'),
+    ('raw_materials_prior', 'jppfs_cor:RawMaterialsAndSupplies', 'Prior1YearInstant')
+)
+
+
+def _scan_attachment(attachment_dir_path: str) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """
+    Attachmentフォルダの詳細財務データと全jppfs_cor項目を一度の走査で抽出
+    
+    Args:
+        attachment_dir_path: Attachmentディレクトリのパス
+    
+    Returns:
+        (詳細財務諸表データ, 全jppfs_cor項目) のタプル
+    """
     
     detailed_data = {}
+    jppfs_items = {}
     
     try:
-        attachment_path = Path(attachment_dir_path)
-        
-        # 貸借対照表ファイルを探す（acbs01）
-        bs_files = list(attachment_path.glob('*acbs01*ixbrl.htm'))
-        
-        if bs_files:
-            with open(bs_files[0], 'r', encoding='utf-8') as f:
-                soup = BeautifulSoup(f.read(), 'html.parser')
+        balance_sheet_found = False
+        
+        # 全てのixbrl.htmファイルを一度ずつ解析（各ファイルは1回しか使わないためメモリ上のキャッシュは通さない）
+        html_files = _scan_htm_files(attachment_dir_path)
+        contents = _iter_file_bytes([html_file.path for html_file in html_files])
+        for html_file, content in zip(html_files, contents):
+            is_balance_sheet = not balance_sheet_found and fnmatch.fnmatchcase(html_file.name, '*acbs01*ixbrl.htm')
+            balance_sheet_found = balance_sheet_found or is_balance_sheet
             
-            # jppfs_cor名前空間の主要項目を抽出
-            detailed_items = {
-                'cash_and_deposits_current': ('jppfs_cor:CashAndDeposits', 'CurrentYearInstant'),
-                'cash_and_deposits_prior': ('jppfs_cor:CashAndDeposits', 'Prior1YearInstant'),
-                'accounts_receivable_current': ('jppfs_cor:NotesAndAccountsReceivableTradeAndContractAssets', 'CurrentYearInstant'),
-                'accounts_receivable_prior': ('jppfs_cor:NotesAndAccountsReceivableTradeAndContractAssets', 'Prior1YearInstant'),
-                'inventory_current': ('jppfs_cor:MerchandiseAndFinishedGoods', 'CurrentYearInstant'),
-                'inventory_prior': ('jppfs_cor:MerchandiseAndFinishedGoods', 'Prior1YearInstant'),
-                'work_in_process_current': ('jppfs_cor:WorkInProcess', 'CurrentYearInstant'),
-                'work_in_process_prior': ('jppfs_cor:WorkInProcess', 'Prior1YearInstant'),
-                'raw_materials_current': ('jppfs_cor:RawMaterialsAndSupplies', 'CurrentYearInstant'),
-                'raw_materials_prior': ('jppfs_cor:RawMaterialsAndSupplies', 'Prior1YearInstant')
-            }
+            # jppfs_cor項目を含まないファイル（抽出対象がない）は解析しない
+            if _JPPFS_PREFIX_BYTES not in content:
+                continue
             
-            for key, (xbrl_tag, context) in detailed_items.items():
-                elem = soup.find(attrs={'name': xbrl_tag, 'contextref': context})
-                if elem:
-                    value = _parse_financial_value(elem)
-                    if value is not None:
-                        detailed_data[key] = value
-                    # 値が存在しない場合は辞書に追加しない（CSV出力時に除外される）
-                # 要素が存在しない場合も辞書に追加しない
-        
+            tree = _parse_ixbrl(content)
+            
+            # 最初の貸借対照表ファイル（acbs01）から主要項目を抽出（索引はこのファイルだけ作る）
+            if is_balance_sheet:
+                index = _build_index(tree)
+                for key, xbrl_tag, context in _DETAILED_ITEMS:
+                    elem = index.get((xbrl_tag, context))
+                    if elem is not None:
+                        value = _parse_financial_value(elem)
+                        if value is not None:
+                            detailed_data[key] = value
+                        # 値が存在しない場合は辞書に追加しない（CSV出力時に除外される）
+                    # 要素が存在しない場合も辞書に追加しない
+            
+            # jppfs_cor名前空間の全項目を取得
+            for elem in _XPATH_NAME_PREFIX(tree, prefix=_JPPFS_PREFIX):
+                name = elem.get('name', '')
+                if not name:
+                    continue
+                    
+                # プレフィックスを除去してキー名を生成
+                key = name[len(_JPPFS_PREFIX):]
+                
+                # コンテキストを確認
+                context = elem.get('contextref', '')
+                
+                # コンテキストに基づいてサフィックスを追加
+                key += _jppfs_context_suffix(context)
+                
+                # 既に存在するキーはスキップ
+                if key in jppfs_items:
+                    continue
+                
+                # 値を取得
+                value = _parse_financial_value(elem)
+                if value is not None:
+                    jppfs_items[key] = value
+                        
     except Exception as e:
-        print(f"⚠️ 詳細財務データ抽出エラー: {e}")
+        print(f"⚠️ Attachment項目の抽出エラー: {e}")
+    
+    return detailed_data, jppfs_items
+
+
+def _comprehensive_cache_file(summary_file_path: str, attachment_dir_path: Optional[str]) -> Path:
+    """
+    包括的データのキャッシュファイルのパスを取得
+    
+    キャッシュの版と、Summaryファイル・Attachment 内の全.htmファイルの名前と内容からキーを作るため、
+    同じ書類を再ダウンロード・再解凍しても（パスや更新時刻が変わっても）同じキャッシュになる。
+    
+    Args:
+        summary_file_path: Summaryファイルのパス
+        attachment_dir_path: Attachmentディレクトリのパス
     
-    return detailed_data
+    Returns:
+        キャッシュファイルのパス
+    """
+    
+    key = _extract_cache_key()
+    files = [(os.path.basename(summary_file_path), summary_file_path)]
+    if attachment_dir_path:
+        entries = sorted(_scan_htm_files(attachment_dir_path), key=lambda entry: entry.name)
+        files.extend((entry.name, entry.path) for entry in entries)
+    for name, path in files:
+        with open(path, 'rb') as f:
+            digest = hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).digest()
+        key.update(name.encode('utf-8') + b'\0' + digest)
+    return CACHE_DIR / 'comprehensive' / f"{key.hexdigest()}.json"
 
 
 def extract_comprehensive_financial_data(summary_file_path: str, attachment_dir_path: str = None) -> Dict[str, Union[str, float]]:
@@ -1177,65 +1952,69 @@ def extract_comprehensive_financial_data(summary_file_path: str, attachment_dir_
     comprehensive_data = {}
     
     try:
+        # 同じ内容のファイルは前回の抽出結果を再利用
+        cache_file = _comprehensive_cache_file(summary_file_path, attachment_dir_path)
+        cached_data = _read_lru_cache(cache_file)
+        if cached_data is not None:
+            return cached_data
+        
         # Summaryファイルを読み込み
-        with open(summary_file_path, 'r', encoding='utf-8') as f:
-            soup = BeautifulSoup(f.read(), 'html.parser')
+        named_elements, index = _load_ixbrl(summary_file_path)
         
         # 1. 日付情報（最優先で左端に配置）
-        filing_date_elem = soup.find(attrs={'name': 'tse-ed-t:FilingDate'})
-        if filing_date_elem:
-            raw_date = filing_date_elem.get_text().strip()
+        filing_date_elem = index.get(('tse-ed-t:FilingDate', None))
+        if filing_date_elem is not None:
+            raw_date = _text(filing_date_elem)
             comprehensive_data['date'] = _format_date_to_iso(raw_date)
         else:
             comprehensive_data['date'] = ''
         
         # 2. 企業基本情報
-        company_data = _extract_comprehensive_company_info(soup)
+        company_data = _extract_comprehensive_company_info(index)
         comprehensive_data.update(company_data)
         
         # 3. 損益計算書データ
-        income_data = _extract_comprehensive_income_statement(soup)
+        income_data = _extract_comprehensive_income_statement(index)
         comprehensive_data.update(income_data)
         
         # 4. 貸借対照表データ
-        balance_data = _extract_comprehensive_balance_sheet(soup)
+        balance_data = _extract_comprehensive_balance_sheet(index)
         comprehensive_data.update(balance_data)
         
         # 5. キャッシュフローデータ
-        cf_data = _extract_cash_flow_data(soup)
+        cf_data = _extract_cash_flow_data(index)
         comprehensive_data.update(cf_data)
         
         # 6. 比率・指標データ
-        ratio_data = _extract_ratios_and_indicators(soup)
+        ratio_data = _extract_ratios_and_indicators(index)
         comprehensive_data.update(ratio_data)
         
         # 7. 配当・株式情報
-        dividend_data = _extract_dividend_and_share_info(soup)
+        dividend_data = _extract_dividend_and_share_info(index)
         comprehensive_data.update(dividend_data)
         
         # 8. その他重要項目
-        other_data = _extract_other_important_items(soup)
+        other_data = _extract_other_important_items(index)
         comprehensive_data.update(other_data)
         
         # 9. Summaryファイルから全tse-ed-t項目を自動抽出（新規追加）
-        all_tse_items = _extract_all_tse_items(soup)
+        all_tse_items = _extract_all_tse_items(named_elements)
         # 既存のキーと重複しないものだけ追加
         for key, value in all_tse_items.items():
             if key not in comprehensive_data:
                 comprehensive_data[key] = value
         
-        # 10. 詳細財務データ（Attachmentから）
+        # 10. 詳細財務データ / 11. 全jppfs_cor項目（Attachmentを一度の走査で抽出）
         if attachment_dir_path:
-            detailed_data = _extract_detailed_financial_data(attachment_dir_path)
+            detailed_data, all_jppfs_items = _scan_attachment(attachment_dir_path)
             comprehensive_data.update(detailed_data)
             
-            # 11. Attachmentから全jppfs_cor項目を自動抽出（新規追加）
-            all_jppfs_items = _extract_all_jppfs_items(attachment_dir_path)
-            # 既存のキーと重複しないものだけ追加
+            # 全jppfs_cor項目は既存のキーと重複しないものだけ追加
             for key, value in all_jppfs_items.items():
                 if key not in comprehensive_data:
                     comprehensive_data[key] = value
         
+        _write_json_cache(cache_file, comprehensive_data)
         return comprehensive_data
         
     except Exception as e:
@@ -1243,12 +2022,16 @@ def extract_comprehensive_financial_data(summary_file_path: str, attachment_dir_
         return {'date': ''}
 
 
+# 数値テキストから取り除く文字（桁区切りのカンマ。前後の空白はfloat()が無視する）
+_NUM_STRIP = str.maketrans('', '', ',')
+
+
 def _parse_financial_value(element) -> Optional[float]:
     """XBRL要素から数値を解析"""
     
     try:
-        # テキスト値を取得
-        text_value = element.get_text().strip().replace(',', '')
+        # テキスト値を取得（桁区切りのカンマを除去）
+        text_value = _raw_text(element).translate(_NUM_STRIP)
         
         # ハイフンや空文字は除外
         if not text_value or text_value == '－' or text_value == '-':
@@ -1273,41 +2056,49 @@ def _parse_financial_value(element) -> Optional[float]:
     return None
 
 
-def _extract_all_tse_items(soup) -> Dict[str, Union[str, float]]:
-    """Summaryファイルから全tse-ed-t項目を自動抽出"""
-    import re
+@functools.lru_cache(maxsize=256)
+def _tse_context_suffix(context: str) -> str:
+    """tse-ed-t項目のキーに付けるサフィックスをコンテキストIDから決定（コンテキストIDごとにキャッシュ）"""
+    
+    if 'CurrentYear' in context:
+        if 'Duration' in context:
+            return '_current'
+        elif 'Instant' in context:
+            return '_currentyear'
+    elif 'PriorYear' in context or 'Prior1Year' in context:
+        if 'Duration' in context:
+            return '_prior'
+        elif 'Instant' in context:
+            return '_prioryear'
+    elif 'NextYear' in context:
+        return '_forecast'
+    return ''
+
+
+def _extract_all_tse_items(named_elements: List[lxml.html.HtmlElement]) -> Dict[str, Union[str, float]]:
+    """Summaryファイルから全tse-ed-t項目を自動抽出（索引作成時の要素リストを使い、文書を再走査しない）"""
     
     tse_items = {}
     
     try:
-        # tse-ed-t名前空間の全項目を取得
-        for elem in soup.find_all(attrs={'name': re.compile(r'^tse-ed-t:')}):
-            name = elem.get('name', '')
-            if not name:
+        # tse-ed-t名前空間の全項目を文書順に処理
+        # 同じキーになる要素（連結・個別など）は後に現れた値で上書きするため、索引（最初の要素のみ）は使わない
+        for elem in named_elements:
+            name = elem.get('name')
+            if not name.startswith(_TSE_PREFIX):
                 continue
-                
+            
             # プレフィックスを除去してキー名を生成
-            key = name.replace('tse-ed-t:', '')
+            key = name[len(_TSE_PREFIX):]
             
             # コンテキストを確認
             context = elem.get('contextref', '')
             
             # コンテキストに基づいてサフィックスを追加
-            if 'CurrentYear' in context:
-                if 'Duration' in context:
-                    key += '_current'
-                elif 'Instant' in context:
-                    key += '_currentyear'
-            elif 'PriorYear' in context or 'Prior1Year' in context:
-                if 'Duration' in context:
-                    key += '_prior'
-                elif 'Instant' in context:
-                    key += '_prioryear'
-            elif 'NextYear' in context:
-                key += '_forecast'
+            key += _tse_context_suffix(context)
             
             # 値を取得
-            text_value = elem.get_text().strip()
+            text_value = _text(elem)
             if not text_value:
                 continue
             
@@ -1318,8 +2109,12 @@ def _extract_all_tse_items(soup) -> Dict[str, Union[str, float]]:
             else:
                 # 数値でない場合は文字列として保存（日付など）
                 if text_value and text_value != '－':
-                    # 日付形式の場合は変換
-                    if '年' in text_value and '月' in text_value:
+                    # 日付形式の場合は変換（「2025年8月19日」形式はその場で整形）
+                    date_match = _RE_JP_DATE.match(text_value)
+                    if date_match:
+                        year, month, day = map(int, date_match.groups())
+                        tse_items[key] = f"{year:04d}-{month:02d}-{day:02d}"
+                    elif '年' in text_value and '月' in text_value:
                         tse_items[key] = _format_date_to_iso(text_value)
                     else:
                         tse_items[key] = text_value
@@ -1330,114 +2125,181 @@ def _extract_all_tse_items(soup) -> Dict[str, Union[str, float]]:
     return tse_items
 
 
-def _extract_all_jppfs_items(attachment_dir_path: str) -> Dict[str, Union[str, float]]:
-    """Attachmentフォルダから全jppfs_cor項目を自動抽出"""
-    import re
-    from pathlib import Path
+def extract_comprehensive_data_from_directory(directory_path: str) -> List[Dict[str, Union[str, float]]]:
+    """
+    XBRLディレクトリから包括的な財務データを抽出
     
-    jppfs_items = {}
+    Args:
+        directory_path: XBRLファイルがあるディレクトリのパス
     
-    try:
-        attachment_path = Path(attachment_dir_path)
-        
-        # 全てのixbrl.htmファイルを処理
-        for html_file in attachment_path.glob('*.htm'):
-            with open(html_file, 'r', encoding='utf-8') as f:
-                soup = BeautifulSoup(f.read(), 'html.parser')
-            
-            # jppfs_cor名前空間の全項目を取得
-            for elem in soup.find_all(attrs={'name': re.compile(r'^jppfs_cor:')}):
-                name = elem.get('name', '')
-                if not name:
-                    continue
-                    
-                # プレフィックスを除去してキー名を生成
-                key = name.replace('jppfs_cor:', '')
-                
-                # コンテキストを確認
-                context = elem.get('contextref', '')
-                
-                # コンテキストに基づいてサフィックスを追加
-                if 'CurrentYearInstant' in context:
-                    key += '_current'
-                elif 'Prior1YearInstant' in context or 'PriorYearInstant' in context:
-                    key += '_prior'
-                elif 'CurrentYearDuration' in context:
-                    key += '_duration_current'
-                elif 'PriorYearDuration' in context:
-                    key += '_duration_prior'
-                
-                # 既に存在するキーはスキップ
-                if key in jppfs_items:
-                    continue
-                
-                # 値を取得
-                value = _parse_financial_value(elem)
-                if value is not None:
-                    jppfs_items[key] = value
-                        
-    except Exception as e:
-        print(f"⚠️ jppfs_cor項目の自動抽出エラー: {e}")
+    Returns:
+        全企業の包括的財務データのリスト
+    """
     
-    return jppfs_items
+    return list(iter_comprehensive_data_from_directory(directory_path))
 
 
-def extract_comprehensive_data_from_directory(directory_path: str) -> List[Dict[str, Union[str, float]]]:
+def iter_comprehensive_data_from_directory(directory_path: str) -> Iterator[Dict[str, Union[str, float]]]:
     """
-    XBRLディレクトリから包括的な財務データを抽出
+    XBRLディレクトリから包括的な財務データを企業ごとに抽出して順に返す
     
     Args:
         directory_path: XBRLファイルがあるディレクトリのパス
     
-    Returns:
-        全企業の包括的財務データのリスト
+    Yields:
+        データを抽出できた企業の包括的財務データ（企業の順番どおり）
     """
     
-    all_financial_data = []
     directory = Path(directory_path)
     
     if not directory.exists():
         print(f"❌ ディレクトリが存在しません: {directory_path}")
-        return []
+        return
     
     print(f"📁 XBRLディレクトリ包括解析開始: {directory_path}")
     print("="*60)
     
-    for company_dir in directory.iterdir():
-        if company_dir.is_dir():
-            company_name = company_dir.name
-            print(f"\n🏢 企業: {company_name}")
-            
-            # Summary フォルダを探す
-            summary_dir = company_dir / 'XBRLData' / 'Summary'
-            attachment_dir = company_dir / 'XBRLData' / 'Attachment'
-            
-            if summary_dir.exists():
-                # ixbrl.htm ファイルを探す
-                ixbrl_files = list(summary_dir.glob('*-ixbrl.htm'))
-                
-                if ixbrl_files:
-                    ixbrl_file = ixbrl_files[0]
-                    print(f"  📄 解析ファイル: {ixbrl_file.name}")
-                    
-                    # 包括的財務データを抽出
-                    attachment_path = str(attachment_dir) if attachment_dir.exists() else None
-                    comprehensive_data = extract_comprehensive_financial_data(str(ixbrl_file), attachment_path)
-                    
-                    if comprehensive_data and comprehensive_data.get('company_name'):
-                        all_financial_data.append(comprehensive_data)
-                        print(f"  ✅ データ抽出成功: {len(comprehensive_data)}項目")
-                    else:
-                        print(f"  ⚠️ データ抽出に失敗しました")
-                else:
-                    print(f"  ⚠️ ixbrl.htmファイルが見つかりません")
-            else:
-                print(f"  ⚠️ Summaryディレクトリが見つかりません")
+    # (企業ディレクトリ, Summaryファイル or None, エラーメッセージ)
+    companies = [(company_dir, *_find_company_ixbrl(company_dir))
+                 for company_dir in directory.iterdir() if company_dir.is_dir()]
+    
+    # 包括的財務データを企業ごとに並列抽出（結果は企業の順番どおりに、抽出され次第受け取る）
+    summary_paths = [str(ixbrl_file) for _, ixbrl_file, _ in companies if ixbrl_file]
+    attachment_paths = [_attachment_path(company_dir) for company_dir, ixbrl_file, _ in companies if ixbrl_file]
+    extracted = _process_imap(extract_comprehensive_financial_data, summary_paths, attachment_paths)
+    
+    extracted_count = 0
+    for company_dir, ixbrl_file, error_message in companies:
+        print(f"\n🏢 企業: {company_dir.name}")
+        
+        if ixbrl_file is None:
+            print(f"  ⚠️ {error_message}")
+            continue
+        
+        print(f"  📄 解析ファイル: {ixbrl_file.name}")
+        comprehensive_data = next(extracted)
+        
+        if comprehensive_data and comprehensive_data.get('company_name'):
+            extracted_count += 1
+            print(f"  ✅ データ抽出成功: {len(comprehensive_data)}項目")
+            yield comprehensive_data
+        else:
+            print(f"  ⚠️ データ抽出に失敗しました")
     
-    print(f"\n✅ 包括解析完了: {len(all_financial_data)}社のデータを抽出")
-    return all_financial_data
+    print(f"\n✅ 包括解析完了: {extracted_count}社のデータを抽出")
+
+
+# 財務関連キーワード
+_FINANCIAL_KEYWORDS = (
+    # 損益関連
+    'Sales', 'sales', 'Revenue', 'revenue',
+    'Income', 'income', 'Profit', 'profit',
+    'Loss', 'loss', 'Expense', 'expense',
+    'Cost', 'cost', 'Margin', 'margin',
+
+    # 資産関連
+    'Asset', 'asset', 'Cash', 'cash',
+    'Deposit', 'deposit', 'Receivable', 'receivable',
+    'Inventory', 'inventory', 'Property', 'property',
+    'Equipment', 'equipment', 'Investment', 'investment',
+    'Goodwill', 'goodwill',
+
+    # 負債関連
+    'Liability', 'liability', 'Payable', 'payable',
+    'Debt', 'debt', 'Loan', 'loan',
+    'Obligation', 'obligation', 'Provision', 'provision',
+
+    # 純資産関連
+    'Equity', 'equity', 'Capital', 'capital',
+    'Surplus', 'surplus', 'Retained', 'retained',
+    'Treasury', 'treasury',
+
+    # キャッシュフロー関連
+    'CashFlow', 'cashflow', 'CF', 'cf',
+    'Operating', 'operating', 'Investing', 'investing',
+    'Financing', 'financing',
+
+    # 株式・配当関連
+    'Share', 'share', 'Stock', 'stock',
+    'Dividend', 'dividend', 'EPS', 'eps',
+    'BPS', 'bps', 'DPS', 'dps',
+
+    # 財務比率関連
+    'Ratio', 'ratio', 'Rate', 'rate',
+    'ROE', 'roe', 'ROA', 'roa', 'ROI', 'roi',
+    'Adequacy', 'adequacy', 'Payout', 'payout',
 
+    # その他財務項目
+    'Depreciation', 'depreciation', 'Amortization', 'amortization',
+    'Allowance', 'allowance', 'Accumulated', 'accumulated',
+    'Deferred', 'deferred', 'Tax', 'tax',
+    'Valuation', 'valuation', 'Comprehensive', 'comprehensive',
+    'Attributable', 'attributable', 'Controlling', 'controlling',
+    'Working', 'working', 'Fixed', 'fixed',
+    'Current', 'current', 'Noncurrent', 'noncurrent',
+    'Prior', 'prior', 'Previous', 'previous',
+    'Quarter', 'quarter', 'Period', 'period',
+    'Year', 'year', 'Annual', 'annual',
+    'Fiscal', 'fiscal', 'Average', 'average',
+    'Total', 'total', 'Net', 'net',
+    'Gross', 'gross',
+    'Ordinary', 'ordinary', 'Extraordinary', 'extraordinary',
+    'Special', 'special', 'Other', 'other',
+    'Before', 'before', 'After', 'after',
+    'Beginning', 'beginning', 'End', 'end',
+    'Increase', 'increase', 'Decrease', 'decrease',
+    'Change', 'change', 'Adjustment', 'adjustment',
+    'Balance', 'balance', 'Amount', 'amount',
+    'Number', 'number', 'Issued', 'issued',
+    'Outstanding', 'outstanding', 'Consolidated', 'consolidated',
+    'NonConsolidated', 'nonconsolidated', 'Segment', 'segment',
+    'Business', 'business', 'Account', 'account',
+    'Statement', 'statement', 'Result', 'result',
+    'Forecast', 'forecast', 'Plan', 'plan',
+    'Budget', 'budget', 'Actual', 'actual',
+    'Member', 'member', 'Mark', 'mark'
+)
 
+# 非財務項目（除外する項目）
+_NON_FINANCIAL_KEYWORDS = (
+    'CompanyName', 'company_name',
+    'DocumentName', 'document_name',
+    'FilingDate', 'filing_date', 'date',
+    'SecuritiesCode', 'securities_code',
+    'Tel', 'tel', 'URL', 'url',
+    'Representative', 'representative',
+    'Inquiries', 'inquiries',
+    'Title', 'title', 'Name', 'name',
+    'TokyoStockExchange', 'NagoyaStockExchange',
+    'SapporoStockExchange', 'FukuokaStockExchange',
+    'JapanSecuritiesDealersAssociation',
+    'GeneralBusiness', 'SpecificBusiness',
+    'FASF', 'fasf', 'Supplemental', 'supplemental',
+    'Convening', 'convening', 'Briefing', 'briefing',
+    'TargetAudience', 'WayOfGetting',
+    'Note', 'note', 'Preamble', 'preamble',
+    'AccountingPolicy', 'AccountingPolicies',
+    'AccountingEstimate', 'AccountingEstimates',
+    'Retrospective', 'retrospective',
+    'Restatement', 'restatement',
+    'SignificantChanges', 'significantchanges',
+    'ApplyingOfSpecific', 'applyingofspecific',
+    'ChangesBasedOnRevisions', 'changesbasedonrevisions',
+    'ChangesOtherThan', 'changesotherthan',
+    'NoteTo', 'noteto', 'SubsidiariesNewly', 'subsidiariesnewly',
+    'SubsidiariesExcluded', 'subsidiariesexcluded',
+    'NameOf', 'nameof', 'Fraction', 'fraction',
+    'Processing', 'processing', 'Method', 'method'
+)
+
+# 判定用の正規表現（小文字化・重複除去したキーワードの選択パターン）
+_RE_FINANCIAL_KEYWORDS = re.compile('|'.join(
+    map(re.escape, dict.fromkeys(k.lower() for k in _FINANCIAL_KEYWORDS))))
+_RE_NON_FINANCIAL_KEYWORDS = re.compile('|'.join(
+    map(re.escape, dict.fromkeys(k.lower() for k in _NON_FINANCIAL_KEYWORDS))))
+
+
+@functools.lru_cache(maxsize=4096)
 def is_financial_item(key: str) -> bool:
     """
     財務項目かどうかを判定
@@ -1448,185 +2310,81 @@ def is_financial_item(key: str) -> bool:
     Returns:
         財務項目の場合True
     """
-    # 財務関連キーワード
-    financial_keywords = [
-        # 損益関連
-        'Sales', 'sales', 'Revenue', 'revenue',
-        'Income', 'income', 'Profit', 'profit',
-        'Loss', 'loss', 'Expense', 'expense',
-        'Cost', 'cost', 'Margin', 'margin',
-        
-        # 資産関連
-        'Asset', 'asset', 'Cash', 'cash',
-        'Deposit', 'deposit', 'Receivable', 'receivable',
-        'Inventory', 'inventory', 'Property', 'property',
-        'Equipment', 'equipment', 'Investment', 'investment',
-        'Goodwill', 'goodwill',
-        
-        # 負債関連
-        'Liability', 'liability', 'Payable', 'payable',
-        'Debt', 'debt', 'Loan', 'loan',
-        'Obligation', 'obligation', 'Provision', 'provision',
-        
-        # 純資産関連
-        'Equity', 'equity', 'Capital', 'capital',
-        'Surplus', 'surplus', 'Retained', 'retained',
-        'Treasury', 'treasury',
-        
-        # キャッシュフロー関連
-        'CashFlow', 'cashflow', 'CF', 'cf',
-        'Operating', 'operating', 'Investing', 'investing',
-        'Financing', 'financing',
-        
-        # 株式・配当関連
-        'Share', 'share', 'Stock', 'stock',
-        'Dividend', 'dividend', 'EPS', 'eps',
-        'BPS', 'bps', 'DPS', 'dps',
-        
-        # 財務比率関連
-        'Ratio', 'ratio', 'Rate', 'rate',
-        'ROE', 'roe', 'ROA', 'roa', 'ROI', 'roi',
-        'Adequacy', 'adequacy', 'Payout', 'payout',
-        
-        # その他財務項目
-        'Depreciation', 'depreciation', 'Amortization', 'amortization',
-        'Allowance', 'allowance', 'Accumulated', 'accumulated',
-        'Deferred', 'deferred', 'Tax', 'tax',
-        'Valuation', 'valuation', 'Comprehensive', 'comprehensive',
-        'Attributable', 'attributable', 'Controlling', 'controlling',
-        'Working', 'working', 'Fixed', 'fixed',
-        'Current', 'current', 'Noncurrent', 'noncurrent',
-        'Prior', 'prior', 'Previous', 'previous',
-        'Quarter', 'quarter', 'Period', 'period',
-        'Year', 'year', 'Annual', 'annual',
-        'Fiscal', 'fiscal', 'Average', 'average',
-        'Total', 'total', 'Net', 'net',
-        'Gross', 'gross', 'Operating', 'operating',
-        'Ordinary', 'ordinary', 'Extraordinary', 'extraordinary',
-        'Special', 'special', 'Other', 'other',
-        'Before', 'before', 'After', 'after',
-        'Beginning', 'beginning', 'End', 'end',
-        'Increase', 'increase', 'Decrease', 'decrease',
-        'Change', 'change', 'Adjustment', 'adjustment',
-        'Balance', 'balance', 'Amount', 'amount',
-        'Number', 'number', 'Issued', 'issued',
-        'Outstanding', 'outstanding', 'Consolidated', 'consolidated',
-        'NonConsolidated', 'nonconsolidated', 'Segment', 'segment',
-        'Business', 'business', 'Account', 'account',
-        'Statement', 'statement', 'Result', 'result',
-        'Forecast', 'forecast', 'Plan', 'plan',
-        'Budget', 'budget', 'Actual', 'actual',
-        'Member', 'member', 'Mark', 'mark'
-    ]
-    
-    # 非財務項目（除外する項目）
-    non_financial_keywords = [
-        'CompanyName', 'company_name',
-        'DocumentName', 'document_name',
-        'FilingDate', 'filing_date', 'date',
-        'SecuritiesCode', 'securities_code',
-        'Tel', 'tel', 'URL', 'url',
-        'Representative', 'representative',
-        'Inquiries', 'inquiries',
-        'Title', 'title', 'Name', 'name',
-        'TokyoStockExchange', 'NagoyaStockExchange',
-        'SapporoStockExchange', 'FukuokaStockExchange',
-        'JapanSecuritiesDealersAssociation',
-        'GeneralBusiness', 'SpecificBusiness',
-        'FASF', 'fasf', 'Supplemental', 'supplemental',
-        'Convening', 'convening', 'Briefing', 'briefing',
-        'TargetAudience', 'WayOfGetting',
-        'Note', 'note', 'Preamble', 'preamble',
-        'AccountingPolicy', 'AccountingPolicies',
-        'AccountingEstimate', 'AccountingEstimates',
-        'Retrospective', 'retrospective',
-        'Restatement', 'restatement',
-        'SignificantChanges', 'significantchanges',
-        'ApplyingOfSpecific', 'applyingofspecific',
-        'ChangesBasedOnRevisions', 'changesbasedonrevisions',
-        'ChangesOtherThan', 'changesotherthan',
-        'NoteTo', 'noteto', 'SubsidiariesNewly', 'subsidiariesnewly',
-        'SubsidiariesExcluded', 'subsidiariesexcluded',
-        'NameOf', 'nameof', 'Fraction', 'fraction',
-        'Processing', 'processing', 'Method', 'method'
-    ]
-    
     # キーを小文字に変換して比較
     key_lower = key.lower()
     
     # 非財務項目の場合はFalse
-    for keyword in non_financial_keywords:
-        if keyword.lower() in key_lower:
-            return False
+    if _RE_NON_FINANCIAL_KEYWORDS.search(key_lower):
+        return False
     
-    # 財務項目の場合はTrue
-    for keyword in financial_keywords:
-        if keyword.lower() in key_lower:
-            return True
-    
-    # どちらにも該当しない場合はFalse（保守的に除外）
-    return False
+    # 財務項目の場合はTrue、どちらにも該当しない場合はFalse（保守的に除外）
+    return _RE_FINANCIAL_KEYWORDS.search(key_lower) is not None
+
 
+# CSVで列として出力する銘柄識別用の項目（カテゴリ行からは除外）
+_CSV_ID_KEYS = frozenset(('date', 'securities_code', 'company_name'))
 
-def output_financial_data_to_csv(financial_data_list: List[Dict[str, Union[str, float]]], output_path: str, all_items: bool = False):
+
+def output_financial_data_to_csv(financial_data_list: Iterable[Dict[str, Union[str, float]]], output_path: str, all_items: bool = False) -> int:
     """
     財務データを縦型フォーマット（date, securities_code, company_name, カテゴリ, データ）でCSVファイルに出力（UTF-8 BOM付き）
     
+    企業ごとに受け取った順に書き込むため、ジェネレーターを渡せば全企業分をメモリに保持しない。
+    
     Args:
-        financial_data_list: 財務データのリスト
+        financial_data_list: 財務データのリスト（またはイテラブル）
         output_path: 出力CSVファイルのパス
         all_items: 全項目を出力するかどうか（デフォルトはFalse = 財務項目のみ）
+    
+    Returns:
+        出力した企業数（CSVの書き込みに失敗した場合は0）
+    
+    Raises:
+        financial_data_listの取り出し中に発生した例外（抽出エラー）はそのまま送出する
     """
     
-    if not financial_data_list:
+    # 1社目を受け取ってからファイルを作成する（データがない場合は空のCSVを作らない）
+    records = iter(financial_data_list)
+    first = next(records, None)
+    if first is None:
         print("❌ 出力するデータがありません")
-        return
+        return 0
     
+    company_count = 0
     try:
         # CSVファイルに出力（UTF-8 BOM付き）
         with open(output_path, 'w', newline='', encoding='utf-8-sig') as csvfile:
             # 縦型フォーマットのヘッダー（銘柄識別用の列を追加）
             fieldnames = ['date', 'securities_code', 'company_name', 'カテゴリ', 'データ']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer = csv.writer(csvfile)
             
             # ヘッダーを書き込み
-            writer.writeheader()
+            writer.writerow(fieldnames)
             
             total_rows = 0
             filtered_count = 0
             
-            # 各企業のデータを処理
-            for data in financial_data_list:
+            # 各企業のデータを受け取り次第処理
+            for data in itertools.chain((first,), records):
                 date_value = data.get('date', '')
                 securities_code = data.get('securities_code', '')
                 company_name = data.get('company_name', '')
                 
-                # 除外する項目（既に列として表示するため）
-                excluded_keys = ['date', 'securities_code', 'company_name']
+                # 空でない値のみ、項目名のアルファベット順に出力
+                keys = sorted(key for key, value in data.items() if value != '' and key not in _CSV_ID_KEYS)
+                rows = [(date_value, securities_code, company_name, key, data[key])
+                        for key in keys if all_items or is_financial_item(key)]
                 
-                # 残りの項目をアルファベット順で出力
-                remaining_keys = sorted([k for k in data.keys() 
-                                       if k not in excluded_keys])
+                # 財務項目のフィルタリングで除外された行数
+                filtered_count += len(keys) - len(rows)
                 
-                for key in remaining_keys:
-                    value = data[key]
-                    if value != '':  # 空でない値のみ出力
-                        # 財務項目のフィルタリング
-                        if not all_items and not is_financial_item(key):
-                            filtered_count += 1
-                            continue
-                            
-                        writer.writerow({
-                            'date': date_value,
-                            'securities_code': securities_code,
-                            'company_name': company_name,
-                            'カテゴリ': key,
-                            'データ': value
-                        })
-                        total_rows += 1
+                # 企業単位でまとめて書き込み
+                writer.writerows(rows)
+                total_rows += len(rows)
+                company_count += 1
         
         print(f"📄 CSV出力完了: {output_path}（UTF-8 BOM付き）")
-        print(f"   企業数: {len(financial_data_list)}社")
+        print(f"   企業数: {company_count}社")
         print(f"   データ行数: {total_rows}行")
         if not all_items and filtered_count > 0:
             print(f"   除外された非財務項目: {filtered_count}行")
@@ -1635,8 +2393,12 @@ def output_financial_data_to_csv(financial_data_list: List[Dict[str, Union[str,
             print(f"   モード: 全項目")
         print(f"   フォーマット: 縦型（date, securities_code, company_name, カテゴリ, データ）")
         
-    except Exception as e:
+    except OSError as e:
+        # 書き込みに失敗したCSVは不完全なため、出力企業数は返さない
         print(f"❌ CSV出力エラー: {e}")
+        return 0
+    
+    return company_count
 
 
 def analyze_xbrl_directory(directory_path: str, output_format: str = 'json') -> Dict[str, Dict]:
@@ -1661,42 +2423,74 @@ def analyze_xbrl_directory(directory_path: str, output_format: str = 'json') ->
     print(f"📁 XBRLディレクトリ解析開始: {directory_path}")
     print("="*60)
     
-    # Summary フォルダの ixbrl.htm ファイルを優先的に解析
-    for company_dir in directory.iterdir():
-        if company_dir.is_dir():
-            company_name = company_dir.name
-            print(f"\n🏢 企業: {company_name}")
+    # Summary フォルダの ixbrl.htm ファイルを優先的に解析（企業名, 解析ファイル or None, エラーメッセージ）
+    companies = [(company_dir.name, *_find_company_ixbrl(company_dir))
+                 for company_dir in directory.iterdir() if company_dir.is_dir()]
+    
+    # 財務データを並列に抽出
+    ixbrl_paths = [str(ixbrl_file) for _, ixbrl_file, _ in companies if ixbrl_file]
+    extracted = iter(extract_financial_data_batch(ixbrl_paths))
+    
+    for company_name, ixbrl_file, error_message in companies:
+        print(f"\n🏢 企業: {company_name}")
+        
+        if ixbrl_file is None:
+            print(f"  ⚠️ {error_message}")
+            continue
+        
+        print(f"  📄 解析ファイル: {ixbrl_file.name}")
+        financial_data = next(extracted)
+        
+        if financial_data:
+            results[company_name] = financial_data
             
-            # Summary フォルダを探す
-            summary_dir = company_dir / 'XBRLData' / 'Summary'
-            if summary_dir.exists():
-                # ixbrl.htm ファイルを探す
-                ixbrl_files = list(summary_dir.glob('*-ixbrl.htm'))
-                
-                if ixbrl_files:
-                    ixbrl_file = ixbrl_files[0]  # 最初のファイルを使用
-                    print(f"  📄 解析ファイル: {ixbrl_file.name}")
-                    
-                    # 財務データを抽出
-                    financial_data = extract_financial_data(str(ixbrl_file))
-                    
-                    if financial_data:
-                        results[company_name] = financial_data
-                        
-                        # 主要データの表示
-                        _display_financial_summary(financial_data)
-                    else:
-                        print(f"  ⚠️ データ抽出に失敗しました")
-                else:
-                    print(f"  ⚠️ ixbrl.htmファイルが見つかりません")
-            else:
-                print(f"  ⚠️ Summaryディレクトリが見つかりません")
+            # 主要データの表示
+            _display_financial_summary(financial_data)
+        else:
+            print(f"  ⚠️ データ抽出に失敗しました")
     
     print(f"\n✅ 解析完了: {len(results)}社のデータを抽出")
     
     return results
 
 
+def remove_directory_tree(directory_path, max_workers=REMOVE_WORKERS):
+    """
+    ディレクトリを中身ごと削除（ファイルの削除はスレッドで並列に実行）
+    
+    Args:
+        directory_path: 削除するディレクトリのパス
+        max_workers: 同時に削除するスレッド数の上限
+    
+    Raises:
+        OSError: 削除に失敗した場合
+    """
+    
+    # os.scandirで一度だけ走査し、ファイルとディレクトリ（親→子の順）に振り分ける
+    files = []
+    directories = []
+    stack = [os.fspath(directory_path)]
+    while stack:
+        directory = stack.pop()
+        directories.append(directory)
+        with os.scandir(directory) as it:
+            for entry in it:
+                # シンボリックリンクはリンク先を辿らずリンク自体を削除する
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    files.append(entry.path)
+    
+    # unlinkはGILを解放するため、小さなファイルが大量にある場合はスレッドで重ねる
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for _ in executor.map(os.unlink, files):
+            pass
+    
+    # 空になったディレクトリを子→親の順に削除
+    for directory in reversed(directories):
+        os.rmdir(directory)
+
+
 def _display_financial_summary(financial_data: Dict):
     """財務データのサマリーを表示"""
     
@@ -1722,9 +2516,10 @@ def _display_financial_summary(financial_data: Dict):
         print(f"  ⚠️ サマリー表示エラー: {e}")
 
 
+@functools.lru_cache(maxsize=256)
 def parse_date(date_str):
     """
-    日付文字列を解析してYYYYMMDD形式に変換
+    日付文字列を解析してYYYYMMDD形式に変換（同じ文字列の2回目以降はキャッシュから返す）
     
     Args:
         date_str: 様々な形式の日付文字列
@@ -1740,6 +2535,16 @@ def parse_date(date_str):
     if len(date_str) == 8 and date_str.isdigit():
         return date_str
     
+    # YYYY-MM-DD / YYYY/MM/DD形式は切り出して検証（strptimeを通さない）
+    if (len(date_str) == 10 and date_str.isascii() and date_str[4] in '-/' and date_str[7] == date_str[4]
+            and date_str[:4].isdigit() and date_str[5:7].isdigit() and date_str[8:].isdigit()):
+        try:
+            date_obj = datetime(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:]))
+            return f"{date_obj.year:04d}{date_obj.month:02d}{date_obj.day:02d}"
+        except ValueError:
+            print(f"❌ 日付形式が不正です: {date_str}")
+            return None
+    
     try:
         # 様々な形式を試す
         formats = [
@@ -1763,10 +2568,9 @@ def parse_date(date_str):
         return None
 
 
-def main():
-    """メイン処理"""
+def _build_parser() -> argparse.ArgumentParser:
+    """コマンドライン引数のパーサーを作成"""
     
-    # コマンドライン引数の解析
     parser = argparse.ArgumentParser(
         description='TDnet XBRL ダウンローダー',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -1873,7 +2677,25 @@ def main():
         help='全項目を出力（デフォルトは財務項目のみ）'
     )
     
-    args = parser.parse_args()
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='一覧ページのキャッシュを使わずに取得し直す（取得結果でキャッシュは更新）'
+    )
+    
+    return parser
+
+
+def main():
+    """メイン処理"""
+    
+    # コマンドライン引数の解析
+    args = _build_parser().parse_args()
+    
+    # キャッシュの無効化
+    if args.no_cache:
+        global USE_LIST_CACHE
+        USE_LIST_CACHE = False
     
     # 日付の処理
     if args.date:
@@ -1912,11 +2734,14 @@ def main():
         # 財務データを解析
         analysis_results = analyze_xbrl_directory(analyze_path)
         
+        # 抽出キャッシュを上限のファイル数に収める
+        prune_cache()
+        
         # JSON出力
         if args.output_json and analysis_results:
             try:
-                with open(args.output_json, 'w', encoding='utf-8') as f:
-                    json.dump(analysis_results, f, ensure_ascii=False, indent=2)
+                with open(args.output_json, 'wb') as f:
+                    f.write(_json_dumps(analysis_results, indent=True))
                 print(f"\n📄 解析結果をJSONファイルに出力: {args.output_json}")
             except Exception as e:
                 print(f"❌ JSON出力エラー: {e}")
@@ -1934,6 +2759,9 @@ def main():
         # 単一ページ取得モード
         xbrl_records = fetch_xbrl_list(date_str, debug=args.debug, page=args.page)
     
+    # 一覧ページのキャッシュを上限のページ数に収める
+    prune_cache()
+    
     if not xbrl_records:
         print("❌ XBRLデータが取得できませんでした")
         return
@@ -1954,11 +2782,18 @@ def main():
     # 結果表示
     print("【XBRLデータ一覧】")
     print("-"*60)
-    for i, record in enumerate(filtered_records, 1):
-        print(f"\n{i}. {record['name']} ({record['code']})")
-        print(f"   タイトル: {record['title']}")
-        print(f"   時刻: {record['time']}")
-        print(f"   XBRL URL: {record['xbrl_url']}")
+    # 件数が多い日でも1件ごとにprintせず、一覧全体をまとめて1回で出力する
+    print(''.join(
+        f"\n{i}. {record['name']} ({record['code']})\n"
+        f"   タイトル: {record['title']}\n"
+        f"   時刻: {record['time']}\n"
+        f"   XBRL URL: {record['xbrl_url']}\n"
+        for i, record in enumerate(filtered_records, 1)
+    ), end='')
+    
+    # ダウンロード対象（件数制限）と保存先は一括処理・ダウンロードの両モードで共通
+    download_records = filtered_records[:args.limit] if args.limit else filtered_records
+    save_dir = f"xbrl_data/{date_str}"
     
     # 一括処理モード
     if args.extract_all:
@@ -1966,61 +2801,45 @@ def main():
         print(f"【一括処理実行】ダウンロード→財務データ抽出→CSV出力")
         print("-"*40)
         
-        # 件数制限
-        download_records = filtered_records
         if args.limit:
-            download_records = filtered_records[:args.limit]
             print(f"制限: {args.limit}件")
-        
-        # 保存先ディレクトリ
-        save_dir = f"xbrl_data/{date_str}"
         print(f"保存先: {save_dir}")
         print(f"処理件数: {len(download_records)}件\n")
         
         # ステップ1: ダウンロード
         print("【ステップ1】XBRLファイルダウンロード")
         print("-"*40)
-        success_count = 0
-        for i, record in enumerate(download_records, 1):
-            print(f"\n[{i}/{len(download_records)}] {record['name']} ({record['code']})")
-            
-            result = download_xbrl_file(
-                record['xbrl_url'],
-                save_dir=save_dir,
-                company_name=record['name'],
-                code=record['code']
-            )
-            
-            if result:
-                success_count += 1
-            
-            # サーバーに負荷をかけないよう少し待機
-            if i < len(download_records):
-                time.sleep(1)
+        # 処理後に削除する場合はZIPファイル自体を保存しない
+        success_count = _run_downloads(download_records, save_dir, save_zip=args.keep_files)
         
         print(f"\n✅ ダウンロード完了: {success_count}/{len(download_records)}件成功")
         
-        # ステップ2: 包括的財務データ抽出
-        print(f"\n【ステップ2】包括的財務データ抽出")
-        print("-"*40)
-        
-        financial_data_list = extract_comprehensive_data_from_directory(save_dir)
-        
-        if not financial_data_list:
-            print("❌ 財務データの抽出に失敗しました")
-            return
-        
-        # ステップ3: CSV出力
-        print(f"\n【ステップ3】CSV出力")
-        print("-"*40)
-        
         # CSV出力ファイル名の決定
         if args.output_csv:
             csv_output_path = args.output_csv
         else:
             csv_output_path = f"financial_data_{date_str}.csv"
         
-        output_financial_data_to_csv(financial_data_list, csv_output_path, all_items=args.all_items)
+        # ステップ2・3: 包括的財務データ抽出とCSV出力（抽出した企業から順に書き込む）
+        print(f"\n【ステップ2・3】包括的財務データ抽出→CSV出力")
+        print("-"*40)
+        
+        financial_data_iter = iter_comprehensive_data_from_directory(save_dir)
+        try:
+            company_count = output_financial_data_to_csv(financial_data_iter, csv_output_path, all_items=args.all_items)
+        except Exception as e:
+            # 途中で抽出が失敗した場合はCSVが不完全なため、ダウンロードしたファイルは削除せずに終了する
+            print(f"❌ 財務データ抽出エラー: {e}")
+            print(f"ℹ️ ダウンロードファイルは保持します: {save_dir}")
+            return
+        
+        # 抽出キャッシュを上限のファイル数に収める
+        prune_cache()
+        
+        if not company_count:
+            print("❌ 財務データの抽出またはCSV出力に失敗しました")
+            print(f"ℹ️ ダウンロードファイルは保持します: {save_dir}")
+            return
         
         # ステップ4: XBRLファイル・ZIPファイルの削除（オプション）
         if not args.keep_files:
@@ -2028,10 +2847,9 @@ def main():
             print("-"*40)
             
             # xbrl_dataディレクトリの削除
-            import shutil
             try:
                 if Path(save_dir).exists():
-                    shutil.rmtree(save_dir)
+                    remove_directory_tree(save_dir)
                     print(f"🗑️ ダウンロードファイル削除完了: {save_dir}")
                 else:
                     print(f"ℹ️ 削除対象ディレクトリが存在しません: {save_dir}")
@@ -2041,7 +2859,7 @@ def main():
         print("\n" + "="*60)
         print(f"🎉 一括処理完了!")
         print(f"   ダウンロード: {success_count}件")
-        print(f"   財務データ抽出: {len(financial_data_list)}社")
+        print(f"   財務データ抽出: {company_count}社")
         print(f"   CSV出力: {csv_output_path}")
         if not args.keep_files:
             print(f"   ファイルクリーンアップ: 完了")
@@ -2057,34 +2875,12 @@ def main():
         print(f"【ステップ3】ダウンロード実行")
         print("-"*40)
         
-        # 件数制限
-        download_records = filtered_records
         if args.limit:
-            download_records = filtered_records[:args.limit]
             print(f"制限: {args.limit}件")
-        
-        # 保存先ディレクトリ
-        save_dir = f"xbrl_data/{date_str}"
         print(f"保存先: {save_dir}")
         print(f"ダウンロード件数: {len(download_records)}件\n")
         
-        success_count = 0
-        for i, record in enumerate(download_records, 1):
-            print(f"\n[{i}/{len(download_records)}] {record['name']} ({record['code']})")
-            
-            result = download_xbrl_file(
-                record['xbrl_url'],
-                save_dir=save_dir,
-                company_name=record['name'],
-                code=record['code']
-            )
-            
-            if result:
-                success_count += 1
-            
-            # サーバーに負荷をかけないよう少し待機
-            if i < len(download_records):
-                time.sleep(1)
+        success_count = _run_downloads(download_records, save_dir)
         
         print("\n" + "="*60)
         print(f"ダウンロード完了: {success_count}/{len(download_records)}件成功")
@@ -0,0 +1,269 @@
+"""
+tdnet_xbrl_downloader の回帰テスト
+
+期待値は高速化前の実装（BeautifulSoup + html.parser 版）で同じフィクスチャを処理した結果。
+"""
+
+import io
+import os
+from pathlib import Path
+
+import pytest
+from urllib3.exceptions import ProtocolError
+
+import tdnet_xbrl_downloader as tdnet
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+LIST_HTML = (FIXTURES / 'I_list_001_20250819.html').read_bytes()
+SUMMARY_PATH = FIXTURES / 'tse-acedjpsm-72030-20250819-ixbrl.htm'
+
+BASE_URL = 'https://www.release.tdnet.info/inbs/'
+
+EXPECTED_RECORDS = [
+    {
+        'time': '15:30',
+        'code': '72030',
+        'name': 'トヨタ自動車',
+        'title': '2026年3月期 第1四半期決算短信〔IFRS〕（連結）',
+        'pdf_url': BASE_URL + '140120250819512345.pdf',
+        'xbrl_url': BASE_URL + '081220250819512345.zip',
+        'place': '東名',
+        'history': ''
+    },
+    {
+        'time': '15:00',
+        'code': '89510',
+        'name': '日本ビルファンド投資法人',
+        'title': '2025年6月期 決算短信（ＲＥＩＴ）',
+        'pdf_url': BASE_URL + '140120250819512347.pdf',
+        'xbrl_url': BASE_URL + '081220250819512347.zip',
+        'place': '東',
+        'history': ''
+    },
+    {
+        'time': '14:00',
+        'code': '65010',
+        'name': '日立製作所',
+        'title': '（訂正）「2026年3月期 第1四半期決算短信〔IFRS〕（連結）」の一部訂正について',
+        'pdf_url': BASE_URL + '140120250819512348.pdf',
+        'xbrl_url': BASE_URL + '081220250819512348.zip',
+        'place': '東',
+        'history': '2025/08/19 14:00'
+    },
+    {
+        'time': '13:00',
+        'code': '27020',
+        'name': '日本マクドナルドホールディングス',
+        'title': '業績予想の修正に関するお知らせ',
+        'pdf_url': BASE_URL + '140120250819512349.pdf',
+        'xbrl_url': BASE_URL + '081220250819512349.zip',
+        'place': '東',
+        'history': ''
+    }
+]
+
+EXPECTED_TSE_ITEMS = {
+    'DocumentName_current': '第1四半期決算短信〔日本基準〕（連結）',
+    'FilingDate_currentyear': '2025-08-19',
+    'CompanyName_currentyear': 'テスト工業株式会社',
+    'SecuritiesCode_currentyear': 72030.0,
+    'FiscalYearEnd_currentyear': '2026-03-31',
+    'NetSales_current': 1230.0,
+    'NetSales_prior': 1100.0,
+    'OperatingIncome_current': 150.0,
+    'OperatingIncome_prior': -20.0,
+    'TotalAssets_currentyear': 5000.0,
+    'TotalAssets_prioryear': 4800.0,
+    'NetSales_forecast': 5200.0,
+    'DividendPayableDateAsPlanned_currentyear': '2025-12-01',
+    'NoteToForecasts': '有'
+}
+
+CSV_DATA = [
+    {
+        'date': '2025-08-19', 'securities_code': '72030', 'company_name': 'テスト工業株式会社',
+        'NetSales_current': 1230.0, 'OperatingIncome_prior': -20.0,
+        'CompanyName_currentyear': 'テスト工業株式会社',
+        'DividendPayableDateAsPlanned_currentyear': '2025-12-01',
+        'NoteToForecasts': '有', 'TotalAssets_currentyear': ''
+    },
+    {
+        'date': '2025-08-19', 'securities_code': '27020', 'company_name': 'サンプル商事',
+        'cash_and_deposits': 300.0, 'NetSales_current': 800.0,
+        'FiscalYearEnd_currentyear': '2025-12-31'
+    }
+]
+
+CSV_HEADER = 'date,securities_code,company_name,カテゴリ,データ\r\n'
+
+EXPECTED_CSV_FINANCIAL = CSV_HEADER + (
+    '2025-08-19,72030,テスト工業株式会社,NetSales_current,1230.0\r\n'
+    '2025-08-19,72030,テスト工業株式会社,OperatingIncome_prior,-20.0\r\n'
+    '2025-08-19,27020,サンプル商事,FiscalYearEnd_currentyear,2025-12-31\r\n'
+    '2025-08-19,27020,サンプル商事,NetSales_current,800.0\r\n'
+    '2025-08-19,27020,サンプル商事,cash_and_deposits,300.0\r\n'
+)
+
+EXPECTED_CSV_ALL = CSV_HEADER + (
+    '2025-08-19,72030,テスト工業株式会社,CompanyName_currentyear,テスト工業株式会社\r\n'
+    '2025-08-19,72030,テスト工業株式会社,DividendPayableDateAsPlanned_currentyear,2025-12-01\r\n'
+    '2025-08-19,72030,テスト工業株式会社,NetSales_current,1230.0\r\n'
+    '2025-08-19,72030,テスト工業株式会社,NoteToForecasts,有\r\n'
+    '2025-08-19,72030,テスト工業株式会社,OperatingIncome_prior,-20.0\r\n'
+    '2025-08-19,27020,サンプル商事,FiscalYearEnd_currentyear,2025-12-31\r\n'
+    '2025-08-19,27020,サンプル商事,NetSales_current,800.0\r\n'
+    '2025-08-19,27020,サンプル商事,cash_and_deposits,300.0\r\n'
+)
+
+
+def _chunks(data, size=100):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_parse_xbrl_list_html_bytes():
+    records, total = tdnet.parse_xbrl_list_html(LIST_HTML)
+
+    assert records == EXPECTED_RECORDS
+    assert total == 136
+
+
+def test_parse_xbrl_list_html_streamed_without_meta_charset():
+    # フィクスチャには<meta charset>がないため、文字コードを渡さないとlatin-1として解釈される
+    records, total = tdnet.parse_xbrl_list_html(iter(_chunks(LIST_HTML)), response_info={'encoding': 'utf-8'})
+
+    assert records == EXPECTED_RECORDS
+    assert total == 136
+
+
+class _FakeResponse:
+    """SESSION.getの戻り値の代わり（ストリーミング受信のみ）"""
+
+    def __init__(self, body, content_type):
+        self.status_code = 200
+        self.headers = {'Content-Type': content_type}
+        # requestsはcharsetのないtext/htmlをISO-8859-1とみなす
+        self.encoding = content_type.partition('charset=')[2] or 'ISO-8859-1'
+        self.raw = io.BytesIO(body)
+
+    def raise_for_status(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class _BrokenStream(io.BytesIO):
+    """途中で接続が切れるresponse.rawの代わり"""
+
+    def read(self, size=-1):
+        if self.tell():
+            raise ProtocolError('Connection broken: IncompleteRead')
+        return super().read(16)
+
+
+def _broken_response(*args, **kwargs):
+    response = _FakeResponse(b'', 'application/zip')
+    response.raw = _BrokenStream(b'PK\x03\x04' + b'\0' * 64)
+    return response
+
+
+def test_download_xbrl_file_handles_broken_stream(monkeypatch, tmp_path):
+    monkeypatch.setattr(tdnet, 'DOWNLOAD_INTERVAL', 0)
+    monkeypatch.setattr(tdnet.SESSION, 'get', _broken_response)
+
+    assert tdnet.download_xbrl_file(BASE_URL + 'x.zip', save_dir=str(tmp_path), save_zip=False) is None
+
+
+@pytest.mark.parametrize('content_type', ['text/html', 'text/html; charset=utf-8'])
+def test_fetch_xbrl_list_with_count_decodes_streamed_page(monkeypatch, tmp_path, content_type):
+    monkeypatch.setattr(tdnet, 'CACHE_DIR', tmp_path)
+    monkeypatch.setattr(tdnet.SESSION, 'get', lambda *args, **kwargs: _FakeResponse(LIST_HTML, content_type))
+
+    records, total = tdnet.fetch_xbrl_list_with_count('20250819')
+
+    assert records == EXPECTED_RECORDS
+    assert total == 136
+
+
+@pytest.mark.parametrize('content_type', ['text/html', 'text/html; charset=utf-8'])
+def test_fetch_xbrl_list_with_count_debug_decodes_page(monkeypatch, tmp_path, content_type):
+    # デバッグ時はHTML全体を取得してから解析する
+    monkeypatch.setattr(tdnet, 'CACHE_DIR', tmp_path)
+    monkeypatch.setattr(tdnet.SESSION, 'get', lambda *args, **kwargs: _FakeResponse(LIST_HTML, content_type))
+
+    records, total = tdnet.fetch_xbrl_list_with_count('20250819', debug=True)
+
+    assert records == EXPECTED_RECORDS
+    assert total == 136
+
+
+def test_fetch_xbrl_list_with_count_handles_broken_stream(monkeypatch, tmp_path):
+    monkeypatch.setattr(tdnet, 'CACHE_DIR', tmp_path)
+    monkeypatch.setattr(tdnet.SESSION, 'get', _broken_response)
+
+    assert tdnet.fetch_xbrl_list_with_count('20250819') == ([], None)
+
+
+def test_extract_all_tse_items_matches_document_order():
+    # 同じキーになる要素は後に現れた値、空の要素は後の重複で補い、contextrefのない要素も含める
+    named_elements, _ = tdnet._load_ixbrl(SUMMARY_PATH)
+
+    tse_items = tdnet._extract_all_tse_items(named_elements)
+
+    assert tse_items == EXPECTED_TSE_ITEMS
+    assert list(tse_items) == list(EXPECTED_TSE_ITEMS)
+
+
+@pytest.mark.parametrize('all_items, expected', [(False, EXPECTED_CSV_FINANCIAL), (True, EXPECTED_CSV_ALL)])
+def test_output_financial_data_to_csv(tmp_path, all_items, expected):
+    output_path = tmp_path / 'out.csv'
+
+    company_count = tdnet.output_financial_data_to_csv(iter(CSV_DATA), str(output_path), all_items=all_items)
+
+    assert company_count == 2
+    assert output_path.read_bytes() == b'\xef\xbb\xbf' + expected.encode('utf-8')
+
+
+def test_output_financial_data_to_csv_without_data(tmp_path):
+    output_path = tmp_path / 'out.csv'
+
+    assert tdnet.output_financial_data_to_csv(iter([]), str(output_path)) == 0
+    assert not output_path.exists()
+
+
+def test_output_financial_data_to_csv_propagates_extraction_error(tmp_path):
+    def records():
+        yield CSV_DATA[0]
+        raise RuntimeError('extraction failed')
+
+    with pytest.raises(RuntimeError):
+        tdnet.output_financial_data_to_csv(records(), str(tmp_path / 'out.csv'))
+
+
+def test_output_financial_data_to_csv_write_error(tmp_path):
+    output_path = tmp_path / 'missing' / 'out.csv'
+
+    assert tdnet.output_financial_data_to_csv(iter(CSV_DATA), str(output_path)) == 0
+
+
+def test_prune_cache_removes_least_recently_used_list_pages(monkeypatch, tmp_path):
+    monkeypatch.setattr(tdnet, 'CACHE_DIR', tmp_path)
+    lists_dir = tmp_path / 'lists'
+    lists_dir.mkdir()
+    for day in range(4):
+        for suffix in ('.html', '.json', '.records.json'):
+            cache_file = lists_dir / f'I_list_001_2025080{day}{suffix}'
+            cache_file.write_text('{}')
+            os.utime(cache_file, (day, day))
+
+    # 再利用したページは最近使ったものとして残る
+    tdnet._read_lru_cache(lists_dir / 'I_list_001_20250800.records.json')
+    tdnet.prune_cache((('lists', 2),))
+
+    assert sorted(path.name for path in lists_dir.iterdir()) == [
+        'I_list_001_20250800.html', 'I_list_001_20250800.json', 'I_list_001_20250800.records.json',
+        'I_list_001_20250803.html', 'I_list_001_20250803.json', 'I_list_001_20250803.records.json'
+    ]